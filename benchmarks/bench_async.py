@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the overhead of checking coroutines.
+
+A documented coroutine function is awaited many times in a loop,
+first undecorated and then decorated by check_all, printing the
+average time of each await; the difference is the overhead of the
+checks of the arguments and of the result.
+
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import types
+
+
+SOURCE = '''
+async def function(a, b=None):
+    """A coroutine.
+
+    a (int): a number.
+    b ([string]|None): some strings.
+
+    return (int): another number.
+
+    """
+    return a
+'''
+
+
+def make_module():
+    """Return a module with the coroutine function to benchmark.
+
+    return (module): the module, registered in sys.modules.
+
+    """
+    module = types.ModuleType("pydc_bench_async")
+    exec(SOURCE, module.__dict__)
+    sys.modules[module.__name__] = module
+    return module
+
+
+async def measure(function, awaits):
+    """Return the average duration of an await of function.
+
+    function (function): the coroutine function to await.
+    awaits (int): the number of awaits.
+
+    return (float): the average duration in seconds.
+
+    """
+    strings = ["a", "b", "c"]
+    start = time.perf_counter()
+    for i in range(awaits):
+        await function(i, strings)
+    return (time.perf_counter() - start) / awaits
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--awaits", type=int, default=200000)
+    args = parser.parse_args()
+
+    module = make_module()
+    plain = asyncio.run(measure(module.function, args.awaits))
+
+    import pydocchecker
+    pydocchecker.check_all([module.__name__])
+    checked = asyncio.run(measure(module.function, args.awaits))
+
+    print("plain=%.0fns checked=%.0fns overhead=%.0fns per await" % (
+        plain * 1e9, checked * 1e9, (checked - plain) * 1e9))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the checking engines.
+
+A documented function is called many times in a loop, with each way
+of checking it (wrappers, trampolines patching the code in place, and
+interpreter hooks), each in a fresh interpreter; the time of each call
+is printed together with the time of a call to a function that is not
+checked, which the hooks engine can slow down too.
+
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+RUN = '''
+import json, sys, time, types
+module = types.ModuleType("pydc_bench_engines")
+exec("""
+def checked(a, b=None):
+    \\"\\"\\"A function.
+
+    a (int): a number.
+    b ([string]|None): some strings.
+
+    return (int): another number.
+
+    \\"\\"\\"
+    return a
+
+
+def unchecked(a, b=None):
+    return a
+""", module.__dict__)
+sys.modules[module.__name__] = module
+import pydocchecker
+options = json.loads(%r)
+if options is not None:
+    pydocchecker.check_all([module.__name__], **options)
+result = {}
+for name in ("checked", "unchecked"):
+    function = getattr(module, name)
+    strings = ["a", "b", "c"]
+    start = time.perf_counter()
+    for i in range(%d):
+        function(i, strings)
+    result[name] = (time.perf_counter() - start) / %d
+print(json.dumps(result))
+'''
+
+
+ENGINES = [
+    ("none", None),
+    ("wrapper", {}),
+    ("in_place", {"in_place": True}),
+    ("hooks", {"engine": "hooks"}),
+    ]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [root] + env.get("PYTHONPATH", "").split(os.pathsep))
+    for name, options in ENGINES:
+        output = subprocess.check_output(
+            [sys.executable, "-c",
+             RUN % (json.dumps(options), args.calls, args.calls)], env=env)
+        result = json.loads(output.decode("utf-8").splitlines()[-1])
+        print("%-8s checked=%.0fns unchecked=%.0fns per call" % (
+            name, result["checked"] * 1e9, result["unchecked"] * 1e9))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the time needed by check_all on a large package.
+
+A synthetic package with many modules, each with documented functions
+and classes, is generated in a temporary directory; then check_all is
+run on it in a fresh interpreter for each number of workers, printing
+the duration of each phase.
+
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+MODULE = '''
+class Class{i}(object):
+    def method(self, a, b=None):
+        """A method.
+
+        a ([{{int: (string, [float])}}]): some data.
+        b (Class{i}|None): another instance.
+
+        return ({{string: [int]}}): some other data.
+
+        """
+        return {{}}
+
+
+def function{i}_{j}(a, *args, **kwargs):
+    """A function.
+
+    a (<(int, string)>|[int]|None): some data {i} {j}.
+    args ([Class{i}]): instances.
+    kwargs ({{string: {{key{j}: int, other: [string]}}}}): options.
+
+    return (int): a number.
+
+    raise (ValueError): never.
+
+    """
+    return 0
+'''
+
+
+RUN = '''
+import importlib, json, sys, time
+sys.path.insert(0, %r)
+for i in range(%d):
+    importlib.import_module("pydc_bench.module%%d" %% i)
+import pydocchecker
+start = time.perf_counter()
+pydocchecker.check_all(["pydc_bench"], workers=%d)
+timings = dict(pydocchecker.STARTUP_TIMINGS)
+timings["total"] = time.perf_counter() - start
+print(json.dumps(timings))
+'''
+
+
+def generate(directory, modules, functions):
+    """Write the synthetic package in directory.
+
+    directory (unicode): where to create the package.
+    modules (int): the number of modules.
+    functions (int): the number of functions in each module.
+
+    """
+    package = os.path.join(directory, "pydc_bench")
+    os.mkdir(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    for i in range(modules):
+        with open(os.path.join(package, "module%d.py" % i), "w") as f:
+            for j in range(functions):
+                f.write(MODULE.format(i=i * functions + j, j=j))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=4000)
+    parser.add_argument("--functions", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[0, 2, 4, 8])
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [root] + env.get("PYTHONPATH", "").split(os.pathsep))
+    with tempfile.TemporaryDirectory() as directory:
+        generate(directory, args.modules, args.functions)
+        for workers in args.workers:
+            output = subprocess.check_output(
+                [sys.executable, "-c",
+                 RUN % (directory, args.modules, workers)], env=env)
+            timings = json.loads(output.decode("utf-8").splitlines()[-1])
+            print("workers=%d %s" % (workers, " ".join(
+                "%s=%.3fs" % (phase, timings[phase])
+                for phase in sorted(timings))))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-#!/usr/bin/env python2
+#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
 # Pydoc Checker
@@ -21,13 +21,21 @@
 
 """
 
-from __future__ import absolute_import
-
+import builtins
+import concurrent.futures
+import contextlib
+import dis
+import gc
 import inspect
 import io
-import q
+import itertools
+import operator
+import os
+import queue
 import re
 import sys
+import threading
+import time
 import traceback
 import types
 
@@ -39,20 +47,170 @@ __version__ = "0.1"
 __author__ = "Stefano Maggiolo <s.maggiolo@gmail.com>"
 
 
-# Resolves custom type names to a list of accepted types.
+# Resolves custom type names to a list of accepted types. "unicode"
+# is kept for pydocs written when strings were not all unicode. Use
+# register_type to add new names.
 TYPES = {
-    "file": [file, io.IOBase],
-    "function": [lambda t: callable(t),
-                 types.FunctionType, types.MethodType],
-    "string": [basestring],
-    "None": [types.NoneType],
+    "file": [io.IOBase],
+    "string": [str],
+    "unicode": [str],
+    "None": [type(None)],
+    }
+
+
+# Resolves custom type names to a list of predicates, accepting an
+# object and returning whether it is of the type. The buffer types
+# accept any object exposing its data through the buffer protocol
+# (like array.array, bytes and memoryview), optionally checking the
+# format of its items. Use register_predicate to add new names.
+PREDICATES = {
+    "function": [callable],
+    "buffer": [lambda t: _buffer_format(t) is not None],
+    "int_buffer": [lambda t: _buffer_format(t) in _INT_FORMATS],
+    "float_buffer": [lambda t: _buffer_format(t) in _FLOAT_FORMATS],
     }
 
 
+# Formats (as in the struct module) of the items of the buffers
+# accepted by int_buffer and float_buffer.
+_INT_FORMATS = frozenset("bBhHiIlLqQnN")
+_FLOAT_FORMATS = frozenset("efd")
+
+
+# Kind (as in dtype.kind of NumPy) of the items of the buffers with
+# each format, for the array annotations; and of the items of each
+# dtype name in the annotations.
+_FORMAT_KINDS = {"?": "b"}
+_FORMAT_KINDS.update((char, "i") for char in "bhilqn")
+_FORMAT_KINDS.update((char, "u") for char in "BHILQN")
+_FORMAT_KINDS.update((char, "f") for char in _FLOAT_FORMATS)
+_DTYPE_KINDS = {"bool": "b", "int": "i", "uint": "u", "float": "f",
+                "complex": "c"}
+
+
 # Configuration, see check_all() for details.
 NONE_ALWAYS_VALID = False
 COMPLAIN_FOR_MISSING_PYDOC = False
 DEBUG = 0
+PROFILE = False
+OVERHEAD_BUDGET = None
+BOUNDARY_ONLY = False
+TRUSTED_PACKAGES = []
+DEFERRED = None
+IN_PLACE = False
+ENGINE = "wrapper"
+COVERAGE = False
+
+
+# Maximum number of deferred checks waiting for the background thread;
+# further checks are dropped (and counted), so that the callers never
+# wait.
+DEFERRED_QUEUE_SIZE = 10000
+
+
+# Parameters of the auto-tuning (see check_all(overhead_budget)): the
+# number of calls after which the cost of the checks of a function is
+# evaluated, one call in how many is checked when a function is
+# sampled, and the duration in seconds a window must exceed for the
+# function to be considered cold (and checked again on each call).
+TUNING_WINDOW = 1024
+TUNING_SAMPLE_INTERVAL = 16
+TUNING_COLD = 10.0
+
+
+# Bounds of the memory used by the profiling mode: the maximum number
+# of distinct types recorded for each argument (the others are just
+# counted), the number of items of a container looked at to describe
+# their type, and the depth of the containers described.
+PROFILE_MAX_TYPES = 8
+PROFILE_SAMPLE = 16
+PROFILE_DEPTH = 2
+
+
+# Duration in seconds of each phase of the last call to check_all().
+STARTUP_TIMINGS = {}
+
+
+class _ProcessStats(object):
+    """Statistics of the checks done by the current process.
+
+    They are updated only when a violation is found, never on calls
+    that pass the checks, so that the pages of a process forked after
+    the decoration stay shared with its parent. They are replaced by
+    after_fork() in the child.
+
+    pid (int): the process the statistics refer to.
+    violations (int): the number of violations reported.
+    dropped (int): the number of deferred checks dropped because the
+        queue was full.
+
+    """
+
+    __slots__ = ("pid", "violations", "dropped")
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.violations = 0
+        self.dropped = 0
+
+
+_stats = _ProcessStats()
+
+
+class _Coverage(object):
+    """The bitmap of the annotations exercised, see check_all(coverage).
+
+    Bits are allocated when decorating, so that recording a hit costs
+    just setting a bit, without allocating anything; the bitmap is
+    extended in place, so that the checkers can keep a reference to
+    it.
+
+    bits (bytearray): one bit for each label, set when hit.
+    labels ([(unicode, unicode|None, unicode|None, unicode|None)]):
+        for each bit, the name of the function, and, for the branches
+        of its annotations, the argument, the whole annotation and the
+        fragment (an alternative of a union, or a key of a record).
+
+    """
+
+    __slots__ = ("bits", "labels")
+
+    def __init__(self):
+        self.bits = bytearray(64)
+        self.labels = []
+
+    def allocate(self, fname, argument=None, annotation=None,
+                 fragment=None):
+        """Allocate a new bit.
+
+        fname (unicode): the name of the function/method.
+        argument (unicode|None): the argument, for a branch.
+        annotation (unicode|None): the annotation, for a branch.
+        fragment (unicode|None): the branch of the annotation.
+
+        return ((int, int)): the index of the byte of the new bit, and
+            the mask selecting it.
+
+        """
+        index = len(self.labels)
+        self.labels.append((fname, argument, annotation, fragment))
+        if index >> 3 >= len(self.bits):
+            self.bits.extend(bytes(len(self.bits)))
+        return index >> 3, 1 << (index & 7)
+
+    def is_set(self, index):
+        """Return whether a bit was set.
+
+        index (int): the index of the bit.
+
+        return (bool): whether the label of the bit was hit.
+
+        """
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+
+# Reset by check_all().
+_coverage = _Coverage()
 
 
 BRACKETS = {
@@ -61,413 +219,2973 @@ BRACKETS = {
     "{": "}",
     "<": ">",
     }
+_CLOSING_BRACKETS = frozenset(BRACKETS.values())
+
+
+# A token of a type annotation, after optional whitespace: either a
+# name (group 1), or a single character (group 2), or nothing at the
+# end of the string.
+_TOKEN = re.compile(r"\s*(?:([^\s\[\](){}<>|,:]+)|(.)|$)", re.DOTALL)
+
+
+# A key of a record: the name, quoted, followed by "?" if optional.
+_RECORD_KEY = re.compile(r"""(['"])([^'"]+)\1(\??)$""")
+
+
+# The parts of an array annotation: the dtype (any, or a kind with an
+# optional size in bits), the bracket with the comma-separated
+# dimensions, and each dimension (a size, a name, "*" or "...").
+_ARRAY_DTYPE = re.compile(
+    r"(?:array|bool|(u?int|float|complex)(8|16|32|64|128)?)$")
+_ARRAY_DIMS = re.compile(r"\[\s*([^\[\](){}<>|:]*?)\s*\]")
+_ARRAY_DIM = re.compile(r"(\d+|[A-Za-z_]\w*|\*|\.\.\.)$")
+
+
+# Classes defined in the loaded modules, indexed by their name; each
+# entry is a list of (module name, class), so that a class can be
+# referred to with any suffix of its dotted name (see _known_types)
+# without storing an entry for each suffix.
+_class_index = {}
+
+
+# Map of patched functions (to fix references of those functions
+# imported in other modules).
+_decoration_map = {}
+
+
+# Profiles of the functions decorated in profiling mode.
+_profiles = []
+
+
+# States of the auto-tuning of the functions decorated with an
+# overhead budget.
+_tunings = []
+
+
+# The packages passed to the last call to check_all.
+_checked_packages = []
+
+
+# The functions and classes defined in each decorated module, after
+# the decoration, to find the modules changed since (see
+# check_all(incremental)).
+_module_states = {}
+
+
+# In boundary-only mode, the package (among the checked and the
+# trusted ones) of the module of each code object calling a decorated
+# function, indexed by file and code object, or "" if it is in none of
+# them (see _caller_package).
+_caller_packages = {}
+
+
+# Annotations extracted from each (cleaned) pydoc, see
+# _pydoc_annotations.
+_pydocs = {}
+
+
+# Annotations of the methods of each class, as defined in the class
+# (see _own_annotation_table) and merged with the ones of the
+# ancestors (see _annotation_table).
+_own_annotation_tables = {}
+_annotation_tables = {}
+
+
+# Cache of the checkers returned by _check, indexed by type
+# description; in this way methods sharing the same annotation (for
+# example, an override and the method it inherits the pydoc from)
+# share the same checker.
+_checkers = {}
+
+
+# Callables receiving the trace events, see add_trace_sink.
+_trace_sinks = []
+
+
+def add_trace_sink(sink):
+    """Send the trace events to sink.
+
+    Events are dicts with an "event" key: "log" events (with "level"
+    and "message") for each message logged with the current debug
+    level, "phase" events (with "phase" and "duration", in seconds)
+    for each phase of check_all, and "violation" events (with
+    "message") for each violation found, also the ones whose warning
+    is not shown again.
+
+    sink (function): a callable accepting an event.
+
+    """
+    _trace_sinks.append(sink)
+
+
+def remove_trace_sink(sink):
+    """Stop sending the trace events to sink.
+
+    sink (function): a callable passed to add_trace_sink.
+
+    """
+    _trace_sinks.remove(sink)
+
+
+def _trace(event, **fields):
+    """Send an event to all the trace sinks.
+
+    Callers in frequently executed code should check that there are
+    sinks before building the fields.
+
+    event (unicode): the kind of the event.
+    fields ({unicode: object}): the data of the event.
+
+    """
+    fields["event"] = event
+    for sink in _trace_sinks:
+        sink(fields)
+
+
+def _log(msg, *args, level=5):
+    """Log msg with q, if debug is enabled.
+
+    The message is formatted, and q imported, only if the level is
+    enabled, so that disabled logging costs just a comparison; hence
+    callers should pass the arguments instead of formatting msg.
+
+    msg (unicode): the message to log, formatted with args if any.
+    args ([object]): the arguments for the placeholders in msg.
+    level (int): the minimum level DEBUG needs to be set in order for
+        this message to be logged. Levels are so organized: do not log
+        anything (0); log the same message that are issued as warnings
+        (1); additional info in case of warnings (2); decisions of the
+        auto-tuning (3); log missing pydoc or type information (4); log
+        all patched functions and found types (5).
+
+    """
+    if DEBUG >= level:
+        if len(args) > 0:
+            msg = msg % args
+        import q
+        q / msg
+        if len(_trace_sinks) > 0:
+            _trace("log", level=level, message=msg)
+
+
+@contextlib.contextmanager
+def _phase(name):
+    """Measure the duration of a phase of check_all.
+
+    The duration is stored in STARTUP_TIMINGS and sent to the trace
+    sinks.
+
+    name (unicode): the name of the phase.
+
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STARTUP_TIMINGS[name] = duration
+        if len(_trace_sinks) > 0:
+            _trace("phase", phase=name, duration=duration)
+
+
+def _warn(msg):
+    """Issue a warning and if necessary, log.
+
+    msg (unicode): the string to log.
+
+    """
+    warn(msg)
+    _log(msg, level=1)
+
+
+def _describe_function(func):
+    """Return the name of the function or method.
+
+    func (function): the function.
+    return (unicode): the name of the function.
+
+    """
+    return getattr(func, "__qualname__", func.__name__)
+
+
+def _find_closing_bracket(string, index):
+    """Return the index of the bracket matching the one at index.
+
+    string (unicode): the string to analyze.
+    index (int): the index in string of the open bracket to match.
+
+    return (int): the index in string of the matching bracket.
+
+    raise (ValueError): if the brackets are not well matched, or if
+        index is invalid.
+
+    """
+    bracket_error = ValueError("Brackets not well matched.")
+    if not 0 <= index < len(string) or string[index] not in BRACKETS:
+        raise ValueError("Invalid index.")
+    waiting_for = []
+    for cur in range(index, len(string)):
+        char = string[cur]
+        if char in BRACKETS:
+            waiting_for.append(BRACKETS[char])
+        elif char in _CLOSING_BRACKETS:
+            if char != waiting_for.pop():
+                raise bracket_error
+            if len(waiting_for) == 0:
+                return cur
+    raise bracket_error
+
+
+class _Node(object):
+    """A node of the tree of a parsed type annotation.
+
+    The nodes do not store the text of their subtree, as building it
+    at each level would cost (and its hashing, when caching the
+    checkers) quadratic time for deeply nested annotations; it is
+    built on demand by the text property.
+
+    kind (unicode): one of "any" (the empty annotation), "name",
+        "list", "tuple", "set", "dict" (homogeneous dict), "record"
+        (dict with named keys), "array" (dtype and shape of an array)
+        and "union".
+    children ((_Node)): the subtrees: the items of lists, sets and
+        tuples, key and value of dicts, the values of records, the
+        alternatives of unions.
+    keys ((unicode)): for names, the name; for records, the names of
+        the keys, in the same order as children; for arrays, the dtype
+        followed by the dimensions.
+    optional (frozenset): for records, the keys that can be missing.
+
+    """
+
+    __slots__ = ("kind", "children", "keys", "optional")
+
+    def __init__(self, kind, children=(), keys=(), optional=frozenset()):
+        self.kind = kind
+        self.children = tuple(children)
+        self.keys = tuple(keys)
+        self.optional = frozenset(optional)
+
+    @property
+    def text(self):
+        """The annotation of the subtree, normalized (so that
+        equivalent annotations have the same text), built in time
+        linear in its length.
+
+        """
+        pieces = []
+        stack = [self]
+        while len(stack) > 0:
+            node = stack.pop()
+            if not isinstance(node, _Node):
+                pieces.append(node)
+            elif node.kind == "name":
+                pieces.append(node.keys[0])
+            elif node.kind == "array":
+                pieces.append("%s[%s]" % (node.keys[0],
+                                          ", ".join(node.keys[1:])))
+            elif node.kind != "any":
+                stack.extend(reversed(node._pieces()))
+        return "".join(pieces)
+
+    def _pieces(self):
+        """Return the text of a bracket or union, with its children.
+
+        return ([unicode|_Node]): the separators of the node, with
+            the children in between.
+
+        """
+        if self.kind == "list":
+            return ["[", self.children[0], "]"]
+        elif self.kind == "set":
+            return ["<", self.children[0], ">"]
+        elif self.kind == "dict":
+            return ["{", self.children[0], ": ", self.children[1], "}"]
+        elif self.kind == "union":
+            separators = ["|"] * len(self.children)
+            opening, closing = "", ""
+        elif self.kind == "tuple":
+            separators = [", "] * len(self.children)
+            opening, closing = "(", ")"
+        else:  # record
+            separators = [
+                "%s'%s'%s: " % (", " if i > 0 else "", name,
+                                "?" if name in self.optional else "")
+                for i, name in enumerate(self.keys)]
+            opening, closing = "{", "}"
+        pieces = [opening]
+        for i, (separator, child) in enumerate(zip(separators,
+                                                   self.children)):
+            if i > 0 or self.kind == "record":
+                pieces.append(separator)
+            pieces.append(child)
+        pieces.append(closing)
+        return pieces
+
+
+def _syntax_error(string, start, position, reason):
+    """Return the error for an annotation that does not parse.
+
+    string (unicode): the string containing the annotation.
+    start (int): the index in string where the annotation starts.
+    position (int): the index in string of the error.
+    reason (unicode): what is wrong.
+
+    return (ValueError): the error to raise.
+
+    """
+    return ValueError("Syntax error in type `%s' at position %d: %s." %
+                      (string[start:].strip(), position - start, reason))
+
+
+def _end_union(frame, expecting, string, start, position):
+    """Return the union of the alternatives collected in frame.
+
+    frame ([object]): the frame of the parser (see _parse_annotation).
+    expecting (bool): whether the parser is expecting a type.
+    string (unicode): the string containing the annotation.
+    start (int): the index in string where the annotation starts.
+    position (int): the index in string of the current token.
+
+    return (_Node|None): the union (or its only alternative), or None
+        if no type was found.
+
+    raise (ValueError): if a type is missing after a "|".
+
+    """
+    alternatives = frame[3]
+    frame[3] = []
+    if expecting:
+        if len(alternatives) > 0:
+            raise _syntax_error(string, start, position, "expected a type")
+        return None
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return _Node("union", alternatives)
+
+
+def _end_element(frame, expecting, string, start, position):
+    """Add the element just parsed to the ones of frame.
+
+    frame ([object]): the frame of the parser (see _parse_annotation).
+    expecting (bool): whether the parser is expecting a type.
+    string (unicode): the string containing the annotation.
+    start (int): the index in string where the annotation starts.
+    position (int): the index in string of the current token.
+
+    raise (ValueError): if the element is missing or incomplete.
+
+    """
+    element = _end_union(frame, expecting, string, start, position)
+    if element is None:
+        raise _syntax_error(string, start, position, "expected a type")
+    if frame[0] == "{":
+        if frame[4] is None:
+            raise _syntax_error(string, start, position, "expected `:'")
+        element = (frame[4], element)
+        frame[4] = None
+    frame[2].append(element)
+
+
+def _close_frame(frame, expecting, string, start, position):
+    """Return the node for the bracket closed at position.
+
+    frame ([object]): the frame of the parser (see _parse_annotation).
+    expecting (bool): whether the parser is expecting a type.
+    string (unicode): the string containing the annotation.
+    start (int): the index in string where the annotation starts.
+    position (int): the index in string of the closing bracket.
+
+    return (_Node): the node for the whole bracket.
+
+    raise (ValueError): if the content of the bracket is not valid.
+
+    """
+    bracket, elements = frame[0], frame[2]
+    if len(elements) > 0 or not expecting or frame[4] is not None:
+        _end_element(frame, expecting, string, start, position)
+
+    if bracket in "[<":
+        if len(elements) == 0:
+            item = _Node("any")
+        else:
+            item = elements[0]
+        return _Node("list" if bracket == "[" else "set", (item,))
+
+    elif bracket == "(":
+        return _Node("tuple", elements)
+
+    else:  # bracket == "{"
+        # Records have quoted keys, "{'key': type_of_value, ...}", with
+        # a "?" after the optional ones. For compatibility, a dict with
+        # more than one key-value and no quoted key is a record with
+        # the names as keys; otherwise, it is of the form
+        # "{type_of_key: type_of_value}".
+        matches = [_RECORD_KEY.match(key.keys[0])
+                   if key.kind == "name" else None
+                   for key, _ in elements]
+        explicit = any(match is not None for match in matches)
+        if len(elements) == 1 and not explicit:
+            return _Node("dict", elements[0])
+        keys = []
+        optional = []
+        for (key, _), match in zip(elements, matches):
+            if match is not None:
+                name = match.group(2)
+                if match.group(3) != "":
+                    optional.append(name)
+            elif explicit:
+                raise _syntax_error(string, start, frame[1],
+                                    "keys of records must be quoted")
+            elif key.kind != "name":
+                raise _syntax_error(string, start, frame[1],
+                                    "keys of records must be names")
+            else:
+                name = key.keys[0]
+            if name in keys:
+                raise _syntax_error(string, start, frame[1],
+                                    "duplicate key `%s'" % name)
+            keys.append(name)
+        return _Node("record", [value for _, value in elements], keys,
+                     optional)
+
+
+def _parse_array(dtype, string, start, position):
+    """Return the node for an array annotation.
+
+    dtype (unicode): the name before the dimensions.
+    string (unicode): the string containing the annotation.
+    start (int): the index in string where the annotation starts.
+    position (int): the index in string of the "[" after dtype.
+
+    return ((_Node, int)): the node, and the index after the "]".
+
+    raise (ValueError): if the dtype or the dimensions are not valid.
+
+    """
+    if _ARRAY_DTYPE.match(dtype) is None:
+        raise _syntax_error(string, start, position,
+                            "unexpected `[' after `%s'" % dtype)
+    match = _ARRAY_DIMS.match(string, position)
+    if match is None:
+        raise _syntax_error(string, start, position, "expected `]'")
+    dims = []
+    if match.group(1) != "":
+        dims = [dim.strip() for dim in match.group(1).split(",")]
+    for i, dim in enumerate(dims):
+        if _ARRAY_DIM.match(dim) is None:
+            raise _syntax_error(string, start, position,
+                                "invalid dimension `%s'" % dim)
+        if dim.isdigit():
+            dims[i] = str(int(dim))
+    if dims.count("...") > 1:
+        raise _syntax_error(string, start, position, "more than one `...'")
+    return _Node("array", keys=[dtype] + dims), match.end()
+
+
+def _parse_annotation(string, start=0, closing=None):
+    """Parse a type annotation into a tree.
+
+    The parser makes a single pass on the string, keeping the open
+    brackets in an explicit stack instead of recursing, so its cost is
+    linear in the length of the annotation, whatever its nesting.
+
+    string (unicode): the string containing the annotation.
+    start (int): the index in string where the annotation starts.
+    closing (unicode|None): if not None, the annotation ends at the
+        first unmatched occurrence of this closing bracket, instead
+        of at the end of string.
+
+    return ((_Node, int)): the root of the tree, and the index where
+        the annotation ends (the one of closing, or the length of
+        string).
+
+    raise (ValueError): if the annotation does not parse; the message
+        contains the position of the error, relative to start.
+
+    """
+    # Each frame is a list with: the open bracket (None for the outer
+    # level), its index, the elements already parsed (separated by
+    # commas), the alternatives of the current element (separated by
+    # "|"), and the key of the current element (only for dicts).
+    stack = [[None, start, [], [], None]]
+    # Whether we are waiting for a type (instead of an operator or a
+    # closing bracket).
+    expecting = True
+    position = start
+    while True:
+        match = _TOKEN.match(string, position)
+        name, char = match.group(1), match.group(2)
+        position = match.end()
+        frame = stack[-1]
+        if name is not None:
+            if not expecting:
+                raise _syntax_error(string, start, match.start(1),
+                                    "unexpected `%s'" % name)
+            if name[0] in "'\"" and (
+                    frame[0] != "{" or frame[4] is not None or
+                    len(frame[3]) > 0 or _RECORD_KEY.match(name) is None):
+                raise _syntax_error(string, start, match.start(1),
+                                    "unexpected `%s'" % name)
+            frame[3].append(_Node("name", keys=(name,)))
+            expecting = False
+            continue
+        at = match.start(2) if char is not None else position
+        if char is None:
+            break
+        elif char == "[" and not expecting and frame[3][-1].kind == "name":
+            # An array: the dimensions of the dtype just parsed.
+            frame[3][-1], position = _parse_array(frame[3][-1].keys[0],
+                                                  string, start, at)
+        elif char in BRACKETS:
+            if not expecting:
+                raise _syntax_error(string, start, at,
+                                    "unexpected `%s'" % char)
+            stack.append([char, at, [], [], None])
+        elif char == "|":
+            if expecting:
+                raise _syntax_error(string, start, at, "expected a type")
+            expecting = True
+        elif char == ",":
+            if frame[0] not in ("(", "{"):
+                raise _syntax_error(string, start, at, "unexpected `,'")
+            _end_element(frame, expecting, string, start, at)
+            expecting = True
+        elif char == ":":
+            if frame[0] != "{" or frame[4] is not None:
+                raise _syntax_error(string, start, at, "unexpected `:'")
+            frame[4] = _end_union(frame, expecting, string, start, at)
+            if frame[4] is None:
+                raise _syntax_error(string, start, at, "expected a type")
+            expecting = True
+        elif frame[0] is None:
+            if char == closing:
+                break
+            raise _syntax_error(string, start, at,
+                                "unmatched `%s'" % char)
+        elif char != BRACKETS[frame[0]]:
+            raise _syntax_error(string, start, at,
+                                "expected `%s'" % BRACKETS[frame[0]])
+        else:
+            node = _close_frame(frame, expecting, string, start, at)
+            stack.pop()
+            stack[-1][3].append(node)
+            expecting = False
+
+    if len(stack) > 1:
+        raise _syntax_error(string, start, stack[-1][1],
+                            "unmatched `%s'" % stack[-1][0])
+    if closing is not None and char is None:
+        raise _syntax_error(string, start, at, "expected `%s'" % closing)
+    root = _end_union(stack[0], expecting, string, start, at)
+    if root is None:
+        root = _Node("any")
+    return root, at
+
+
+def _buffer_format(obj):
+    """Return the format of the items in the buffer exposed by obj.
+
+    Only the metadata of the buffer is read, so the cost does not
+    depend on its size.
+
+    obj (object): the object to inspect.
+
+    return (unicode|None): the format of the items (as in the struct
+        module, without byte order), or None if obj does not support
+        the buffer protocol.
+
+    """
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        return None
+    with view:
+        return view.format.lstrip("@=<>!")
+
+
+def _check(type_):
+    """Return a function checking that an object is of a certain type.
+
+    Checkers are cached, so that each type description is compiled
+    only once.
+
+    type_ (unicode): the name of the type to resolve.
+
+    return (_Checker): a checker accepting an object and returning
+        True if the object is of type type_, and False otherwise.
+
+    raise (ValueError): if the type description is invalid (does not
+        parse).
+
+    """
+    if type_ not in _checkers:
+        root, _ = _parse_annotation(type_)
+        _checkers[type_] = _check_node(root)
+    return _checkers[type_]
+
+
+def _check_node(root):
+    """Return the checker for a parsed type annotation.
+
+    The checkers of the subtrees are compiled before their parents,
+    visiting the tree with an explicit stack, and shared with the
+    equivalent subtrees of all annotations (see _shared_checker).
+
+    root (_Node): the tree of the annotation.
+
+    return (_Checker): the checker for root.
+
+    """
+    checkers = {}
+    stack = [(root, False)]
+    while len(stack) > 0:
+        node, children_done = stack.pop()
+        if children_done:
+            checkers[id(node)] = _shared_checker(
+                node, [checkers[id(child)] for child in node.children])
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children)
+    return checkers[id(root)]
+
+
+def _shared_checker(node, children):
+    """Return the checker for a node, compiling it if needed.
+
+    Checkers are cached by the kind and keys of the node, and by the
+    checkers of its children: as these are shared in turn, equivalent
+    subtrees get the same checker, and the key has a constant size
+    for each child, however deep it is.
+
+    node (_Node): the parsed annotation.
+    children ([_Checker]): the checkers of the children of node.
+
+    return (_Checker): the checker for node.
+
+    """
+    key = (node.kind, node.keys, node.optional, tuple(children))
+    checker = _checkers.get(key)
+    if checker is None:
+        checker = _checkers[key] = _compile_checker(node, children)
+    return checker
+
+
+class _Checker(object):
+    """A compiled check that an object is of a certain type.
+
+    Checkers are callables accepting an object and returning True if
+    the object is of the type they were compiled from, and False
+    otherwise. Subcheckers are compiled once together with their
+    parent, and all checkers use __slots__ to keep them small and fast
+    to access.
+
+    """
+
+    __slots__ = ()
+
+    # Whether accepts_class can be used instead of calling the
+    # checker on each object.
+    by_class = False
+
+    def __call__(self, obj):
+        """Check obj.
+
+        obj (object): the object to check.
+
+        return (bool): whether obj is of the required type.
+
+        """
+        raise NotImplementedError
+
+    def accepts_class(self, cls):
+        """Check that all instances of cls are of the required type.
+
+        cls (type): the class to check.
+
+        return (bool|None): whether the instances of cls are of the
+            required type, or None if this cannot be decided from the
+            class alone.
+
+        """
+        return None
+
+
+def _check_items(item, items):
+    """Check that all items are accepted by a checker.
+
+    When the checker can decide from the class alone, the classes of
+    the items are collected in a single pass in C, and only the
+    distinct ones are checked, so that homogeneous containers are
+    checked in bulk. Otherwise, or if some class is refused (so that
+    the reason is found with the exact semantic of isinstance), the
+    checker is called on each item.
+
+    item (_Checker): the checker for each item.
+    items (iterable): the items to check.
+
+    return (bool): whether all items are accepted.
+
+    """
+    if isinstance(item, _AnyChecker):
+        return True
+    if item.by_class:
+        for cls in set(map(type, items)):
+            if not item.accepts_class(cls):
+                break
+        else:
+            return True
+    return all(map(item, items))
+
+
+class _AnyChecker(_Checker):
+    """Checker accepting any object."""
+
+    __slots__ = ()
+
+    by_class = True
+
+    def __call__(self, obj):
+        return True
+
+    def accepts_class(self, cls):
+        return True
+
+
+# Shared by all annotations accepting anything.
+_ANY = _AnyChecker()
+
+
+class _UnionChecker(_Checker):
+    """Checker for <type>|<type>|..."""
+
+    __slots__ = ("alternatives", "by_class")
+
+    def __init__(self, alternatives):
+        self.alternatives = tuple(alternatives)
+        self.by_class = all(alternative.by_class
+                            for alternative in self.alternatives)
+
+    def __call__(self, obj):
+        for alternative in self.alternatives:
+            if alternative(obj):
+                return True
+        return False
+
+    def accepts_class(self, cls):
+        ret = False
+        for alternative in self.alternatives:
+            accepted = alternative.accepts_class(cls)
+            if accepted:
+                return True
+            elif accepted is None:
+                ret = None
+        return ret
+
+
+class _ListChecker(_Checker):
+    """Checker for [<type>]."""
+
+    __slots__ = ("item",)
+
+    def __init__(self, item):
+        self.item = item
+
+    def __call__(self, obj):
+        if obj is None:
+            return NONE_ALWAYS_VALID
+        if not isinstance(obj, list):
+            return False
+        return _check_items(self.item, obj)
+
+
+class _TupleChecker(_Checker):
+    """Checker for (<type>, ..., <type>)."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        self.items = tuple(items)
+
+    def __call__(self, obj):
+        if obj is None:
+            return NONE_ALWAYS_VALID
+        if not isinstance(obj, tuple):
+            return False
+        if len(self.items) != len(obj):
+            return False
+        for element, item in zip(obj, self.items):
+            if not item(element):
+                return False
+        return True
+
+
+class _SetChecker(_Checker):
+    """Checker for <<type>>."""
+
+    __slots__ = ("item",)
+
+    def __init__(self, item):
+        self.item = item
+
+    def __call__(self, obj):
+        if obj is None:
+            return NONE_ALWAYS_VALID
+        if not isinstance(obj, set):
+            return False
+        return _check_items(self.item, obj)
+
+
+class _DictChecker(_Checker):
+    """Checker for {<type>: <type>}."""
+
+    __slots__ = ("key", "value")
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+    def __call__(self, obj):
+        if obj is None:
+            return NONE_ALWAYS_VALID
+        if not isinstance(obj, dict):
+            return False
+        return _check_items(self.key, obj.keys()) and \
+            _check_items(self.value, obj.values())
+
+
+# Returned looking up the optional keys missing from a record.
+_ABSENT = object()
+
+
+class _RecordChecker(_Checker):
+    """Checker for {'<key>': <type>, ..., '<key>'?: <type>}.
+
+    The schema is split once: the values of all the required keys are
+    fetched with a single call (failing if some is missing), and
+    checked in one pass, followed by the values of the optional keys
+    present. For subclasses of dict, where a missing key may call
+    __missing__, the presence of the required keys is checked first
+    with a single set operation.
+
+    """
+
+    __slots__ = ("required", "fields", "optional", "values", "checkers")
+
+    def __init__(self, fields, optional):
+        fields = tuple(fields)
+        self.fields = tuple(field for field in fields
+                            if field[0] not in optional)
+        self.optional = tuple(field for field in fields
+                              if field[0] in optional)
+        keys = tuple(key for key, _ in self.fields)
+        self.required = frozenset(keys)
+        # Returning always a tuple, as itemgetter does for two keys
+        # or more.
+        if len(keys) == 0:
+            self.values = lambda obj: ()
+        elif len(keys) == 1:
+            self.values = lambda obj: (obj[keys[0]],)
+        else:
+            self.values = operator.itemgetter(*keys)
+        self.checkers = tuple(value_checker
+                              for _, value_checker in self.fields)
+
+    def __call__(self, obj):
+        if obj is None:
+            return NONE_ALWAYS_VALID
+        if not isinstance(obj, dict):
+            return False
+        if type(obj) is not dict and not obj.keys() >= self.required:
+            return False
+        try:
+            values = self.values(obj)
+        except KeyError:
+            return False
+        for value_checker, value in zip(self.checkers, values):
+            if not value_checker(value):
+                return False
+        for key, value_checker in self.optional:
+            value = obj.get(key, _ABSENT)
+            if value is not _ABSENT and not value_checker(value):
+                return False
+        return True
+
+
+class _CoveredUnionChecker(_UnionChecker):
+    """Checker for <type>|<type>|..., recording in the coverage bitmap
+    which alternatives accepted some object."""
+
+    __slots__ = ("bits", "marks")
+
+    def __init__(self, alternatives, marks):
+        _UnionChecker.__init__(self, alternatives)
+        self.bits = _coverage.bits
+        self.marks = tuple((alternative, byte, mask)
+                           for alternative, (byte, mask)
+                           in zip(self.alternatives, marks))
+
+    def __call__(self, obj):
+        for alternative, byte, mask in self.marks:
+            if alternative(obj):
+                self.bits[byte] |= mask
+                return True
+        return False
+
+    def accepts_class(self, cls):
+        ret = False
+        for alternative, byte, mask in self.marks:
+            accepted = alternative.accepts_class(cls)
+            if accepted:
+                self.bits[byte] |= mask
+                return True
+            elif accepted is None:
+                ret = None
+        return ret
+
+
+class _CoveredRecordChecker(_RecordChecker):
+    """Checker for {'<key>': <type>, ..., '<key>'?: <type>}, recording
+    in the coverage bitmap which keys had a valid value."""
+
+    __slots__ = ("bits", "marked_fields", "marked_optional")
+
+    def __init__(self, fields, optional, marks):
+        _RecordChecker.__init__(self, fields, optional)
+        self.bits = _coverage.bits
+        self.marked_fields = tuple((value_checker,) + marks[key]
+                                   for key, value_checker in self.fields)
+        self.marked_optional = tuple((key, value_checker) + marks[key]
+                                     for key, value_checker
+                                     in self.optional)
+
+    def __call__(self, obj):
+        if obj is None:
+            return NONE_ALWAYS_VALID
+        if not isinstance(obj, dict):
+            return False
+        if type(obj) is not dict and not obj.keys() >= self.required:
+            return False
+        try:
+            values = self.values(obj)
+        except KeyError:
+            return False
+        bits = self.bits
+        for (value_checker, byte, mask), value in zip(self.marked_fields,
+                                                      values):
+            if not value_checker(value):
+                return False
+            bits[byte] |= mask
+        for key, value_checker, byte, mask in self.marked_optional:
+            value = obj.get(key, _ABSENT)
+            if value is not _ABSENT:
+                if not value_checker(value):
+                    return False
+                bits[byte] |= mask
+        return True
+
+
+class _ArrayChecker(_Checker):
+    """Checker for <dtype>[<dim>, ..., <dim>].
+
+    Only the metadata of the arrays is read, so the cost does not
+    depend on their size: the dtype and shape of the objects having
+    them (like the arrays of NumPy, which is not needed otherwise),
+    or the format and shape of the buffer exposed by the others (like
+    array.array and memoryview).
+
+    kind (unicode|None): the kind of the items, as in dtype.kind, if
+        constrained.
+    itemsize (int|None): the size in bytes of the items, if
+        constrained.
+    leading ((int|unicode|None)): the dimensions before "..." (all of
+        them, if there is no "..."): a size, the name of a size that
+        must be the same in all dimensions with that name, or None
+        for any size.
+    trailing ((int|unicode|None)|None): the dimensions after "...",
+        or None if there is no "...".
+    named (bool): whether some name is used in more than one
+        dimension.
+
+    """
+
+    __slots__ = ("kind", "itemsize", "leading", "trailing", "named")
+
+    def __init__(self, dtype, dims):
+        match = _ARRAY_DTYPE.match(dtype)
+        self.kind = _DTYPE_KINDS.get(match.group(1) or dtype)
+        self.itemsize = None if match.group(2) is None \
+            else int(match.group(2)) // 8
+        names = [dim for dim in dims if dim[0].isalpha() or dim[0] == "_"]
+        repeated = set(name for name in names if names.count(name) > 1)
+        self.named = len(repeated) > 0
+        sizes = [int(dim) if dim.isdigit()
+                 else dim if dim in repeated or dim == "..."
+                 else None
+                 for dim in dims]
+        if "..." in sizes:
+            index = sizes.index("...")
+            self.leading = tuple(sizes[:index])
+            self.trailing = tuple(sizes[index + 1:])
+        else:
+            self.leading = tuple(sizes)
+            self.trailing = None
+
+    def __call__(self, obj):
+        dtype = getattr(obj, "dtype", None)
+        if dtype is not None:
+            try:
+                kind, itemsize, shape = dtype.kind, dtype.itemsize, obj.shape
+            except AttributeError:
+                return False
+        else:
+            try:
+                view = memoryview(obj)
+            except TypeError:
+                return obj is None and NONE_ALWAYS_VALID
+            with view:
+                kind = _FORMAT_KINDS.get(view.format.lstrip("@=<>!"))
+                itemsize, shape = view.itemsize, view.shape
+        if self.kind is not None and kind != self.kind:
+            return False
+        if self.itemsize is not None and itemsize != self.itemsize:
+            return False
+        return self.accepts_shape(shape)
+
+    def accepts_shape(self, shape):
+        """Check the dimensions of an array.
+
+        shape ((int)): the size of each dimension of the array.
+
+        return (bool): whether the dimensions are the required ones.
+
+        """
+        leading, trailing = self.leading, self.trailing
+        if trailing is None:
+            if len(shape) != len(leading):
+                return False
+            sizes = zip(leading, shape)
+        else:
+            if len(shape) < len(leading) + len(trailing):
+                return False
+            sizes = itertools.chain(
+                zip(leading, shape),
+                zip(trailing, shape[len(shape) - len(trailing):]))
+        bound = {} if self.named else None
+        for dim, size in sizes:
+            if dim is None:
+                continue
+            elif isinstance(dim, int):
+                if dim != size:
+                    return False
+            elif bound.setdefault(dim, size) != size:
+                return False
+        return True
+
+
+class _PredicateChecker(_Checker):
+    """Checker for a name with a single predicate and no type."""
+
+    __slots__ = ("predicate",)
+
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def __call__(self, obj):
+        return bool(self.predicate(obj)) or \
+            (obj is None and NONE_ALWAYS_VALID)
+
+
+class _KnownTypeChecker(_Checker):
+    """Checker for a name with both types and predicates."""
+
+    __slots__ = ("classes", "predicates")
+
+    by_class = True
+
+    def __init__(self, classes, predicates):
+        self.classes = tuple(classes)
+        self.predicates = tuple(predicates)
+
+    def __call__(self, obj):
+        if isinstance(obj, self.classes):
+            return True
+        for predicate in self.predicates:
+            if predicate(obj):
+                return True
+        if obj is None:
+            return NONE_ALWAYS_VALID
+        return False
+
+    def accepts_class(self, cls):
+        if issubclass(cls, self.classes):
+            return True
+        if len(self.predicates) > 0:
+            return None
+        return cls is type(None) and NONE_ALWAYS_VALID
+
+
+class _TypeChecker(_Checker):
+    """Checker for a type found evaluating its name, or for a tuple of
+    types registered with the same name."""
+
+    __slots__ = ("type_",)
+
+    by_class = True
+
+    def __init__(self, type_):
+        self.type_ = type_
+
+    def __call__(self, obj):
+        return isinstance(obj, self.type_) or \
+            (obj is None and NONE_ALWAYS_VALID)
+
+    def accepts_class(self, cls):
+        return issubclass(cls, self.type_) or \
+            (cls is type(None) and NONE_ALWAYS_VALID)
+
+
+class _PendingChecker(_Checker):
+    """Checker for a name not resolved yet, accepting any object.
+
+    When a module defining a class with that name is imported, the
+    checker is resolved, and from then on delegates to the checker of
+    the class; in this way, all the checkers containing it are
+    upgraded without compiling them again.
+
+    """
+
+    __slots__ = ("name", "resolved")
+
+    by_class = True
+
+    def __init__(self, name):
+        self.name = name
+        self.resolved = None
+
+    def __call__(self, obj):
+        resolved = self.resolved
+        return resolved is None or resolved(obj)
+
+    def accepts_class(self, cls):
+        resolved = self.resolved
+        return resolved is None or resolved.accepts_class(cls)
+
+
+def _pending_checker(name):
+    """Return a checker for a name to resolve later.
+
+    name (unicode): the type name that cannot be resolved now.
+
+    return (_PendingChecker): the checker, registered to be resolved
+        when a class with that name is loaded.
+
+    """
+    _log("Type `%s' not found, waiting for it to be imported.", name,
+         level=4)
+    checker = _PendingChecker(name)
+    _pending.setdefault(name.rpartition(".")[2], []).append(checker)
+    if _import_watcher not in sys.meta_path:
+        sys.meta_path.insert(0, _import_watcher)
+    return checker
+
+
+def _index_module(name, module):
+    """Add the classes defined in a module to the known types.
+
+    name (unicode): the name of the module.
+    module (module): the module.
+
+    return ([unicode]): the names of the classes added.
+
+    """
+    keys = []
+    for key, value in list(module.__dict__.items()):
+        if not hasattr(value, "__module__") or \
+                value.__module__ != name:
+            continue
+        if isinstance(value, type):
+            entries = _class_index.setdefault(key, [])
+            if (name, value) in entries:
+                continue
+            _log("Adding type %s.%s.", name, key, level=5)
+            entries.append((name, value))
+            keys.append(key)
+    return keys
+
+
+def _module_loaded(module):
+    """Resolve the pending names referring to classes in a module.
+
+    module (module): a module just imported.
+
+    """
+    for key in _index_module(module.__name__, module):
+        if key not in _pending:
+            continue
+        still_pending = []
+        for checker in _pending.pop(key):
+            classes, predicates = _known_types(checker.name)
+            if len(classes) + len(predicates) > 0:
+                _log("Type `%s' resolved.", checker.name, level=4)
+                checker.resolved = _known_type_checker(classes, predicates)
+            else:
+                still_pending.append(checker)
+        if len(still_pending) > 0:
+            _pending[key] = still_pending
+
+
+class _NotifyingLoader(object):
+    """Loader calling _module_loaded after executing a module.
+
+    It wraps the loader of a single spec, as the same loader can be
+    shared by many modules (for example, all the ones in a zip file);
+    once the module is executed, the spec and the module refer to the
+    original loader again.
+
+    loader (Loader): the loader wrapped.
+
+    """
+
+    __slots__ = ("loader",)
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        """Create the module, see importlib.abc.Loader.
+
+        spec (ModuleSpec): the spec of the module.
+
+        return (module|None): the module, or None for the default.
+
+        """
+        create_module = getattr(self.loader, "create_module", None)
+        if create_module is None:
+            return None
+        return create_module(spec)
+
+    def exec_module(self, module):
+        """Execute the module, then notify it is loaded.
+
+        module (module): the module to execute.
+
+        """
+        if getattr(module, "__spec__", None) is not None and \
+                module.__spec__.loader is self:
+            module.__spec__.loader = self.loader
+        if getattr(module, "__loader__", None) is self:
+            module.__loader__ = self.loader
+        self.loader.exec_module(module)
+        _module_loaded(module)
+
+
+class _ImportWatcher(object):
+    """Finder calling _module_loaded after each module is imported.
+
+    It finds nothing by itself: it asks the other finders, and wraps
+    the loader they return to notify when the module is executed.
+
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        """Find the spec of a module, see importlib.abc.MetaPathFinder.
+
+        fullname (unicode): the name of the module.
+        path ([unicode]|None): where to look for submodules.
+        target (module|None): the module to reload, if any.
+
+        return (ModuleSpec|None): the spec of the module, with its
+            loader wrapped, or None if no finder found it.
+
+        """
+        if len(_pending) == 0:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _NotifyingLoader(spec.loader)
+        return spec
+
+
+# Checkers of the names not resolved yet, indexed by the last
+# component of the name; and the finder resolving them on import.
+_pending = {}
+_import_watcher = _ImportWatcher()
+
+
+def _known_types(name):
+    """Return the types a name in an annotation refers to.
+
+    name (unicode): a (possibly dotted) type name.
+
+    return (([type], [function])): the equivalent types in TYPES,
+        followed by the classes in the loaded modules whose complete
+        name (module and class name) ends with name; and the
+        predicates in PREDICATES.
+
+    """
+    classes = []
+    predicates = list(PREDICATES.get(name, []))
+    for equivalent_type in TYPES.get(name, []):
+        # For compatibility, TYPES can also contain predicates.
+        if isinstance(equivalent_type, type):
+            classes.append(equivalent_type)
+        else:
+            predicates.append(equivalent_type)
+    key = name.rpartition(".")[2]
+    for module_name, cls in _class_index.get(key, []):
+        if (".%s.%s" % (module_name, key)).endswith("." + name):
+            classes.append(cls)
+    return classes, predicates
+
+
+def _known_type_checker(classes, predicates):
+    """Return the cheapest checker for some types and predicates.
+
+    classes ([type]): the types accepted.
+    predicates ([function]): the predicates accepting objects.
+
+    return (_Checker): a single isinstance with all types, if there
+        are no predicates; a single call, if there is only one
+        predicate and no type; otherwise, a checker trying the types
+        first and then each predicate.
+
+    """
+    if len(predicates) == 0:
+        return _TypeChecker(tuple(classes))
+    if len(classes) == 0 and len(predicates) == 1:
+        return _PredicateChecker(predicates[0])
+    return _KnownTypeChecker(classes, predicates)
+
+
+def register_type(name, *classes):
+    """Make a name in the annotations accept instances of some types.
+
+    To be called before check_all, as the annotations are compiled
+    when decorating.
+
+    name (unicode): the name to use in the annotations.
+    classes ([type]): the types accepted by name, in addition to the
+        ones already registered.
+
+    """
+    TYPES.setdefault(name, []).extend(classes)
+
+
+def register_predicate(name, predicate):
+    """Make a name in the annotations accept objects by a predicate.
+
+    Predicates are called on each object to check, so they should be
+    fast; when a name has only one predicate and no type, checking it
+    costs just a call to the predicate. To be called before check_all,
+    as the annotations are compiled when decorating.
+
+    name (unicode): the name to use in the annotations.
+    predicate (function): a callable accepting an object and returning
+        whether it is of the type.
+
+    """
+    PREDICATES.setdefault(name, []).append(predicate)
+
+
+def _compile_checker(node, children):
+    """Return a new checker for objects of a certain type.
+
+    node (_Node): the parsed annotation.
+    children ([_Checker]): the checkers of the children of node.
+
+    return (_Checker): a checker accepting an object and returning
+        True if the object is of the type described by node, and False
+        otherwise.
+
+    """
+    if node.kind == "any":
+        return _ANY
+    elif node.kind == "union":
+        return _UnionChecker(children)
+    elif node.kind == "list":
+        return _ListChecker(children[0])
+    elif node.kind == "tuple":
+        return _TupleChecker(children)
+    elif node.kind == "set":
+        return _SetChecker(children[0])
+    elif node.kind == "dict":
+        return _DictChecker(children[0], children[1])
+    elif node.kind == "record":
+        return _RecordChecker(zip(node.keys, children), node.optional)
+    elif node.kind == "array":
+        return _ArrayChecker(node.keys[0], node.keys[1:])
+    else:
+        # Simple type.
+        type_ = node.keys[0]
+        classes, predicates = _known_types(type_)
+        if len(classes) + len(predicates) > 0:
+            return _known_type_checker(classes, predicates)
+        real_type = _resolve_name(type_)
+        if real_type is None:
+            # The type may be defined in a module not imported yet.
+            return _pending_checker(type_)
+        if not isinstance(real_type, type):
+            raise ValueError("`%s' is not a type." % type_)
+        return _TypeChecker(real_type)
+
+
+def _resolve_name(name):
+    """Return the object a name not among the known types refers to.
+
+    Only the builtins and the loaded modules are looked up, never the
+    namespace of this module, and nothing is evaluated.
+
+    name (unicode): a (possibly dotted) name.
+
+    return (object|None): the builtin with that name, or the module or
+        the attribute of a module whose complete name is name; None if
+        there is none.
+
+    """
+    if name in builtins.__dict__:
+        return builtins.__dict__[name]
+    module_name, attributes = name, []
+    while module_name not in sys.modules:
+        if "." not in module_name:
+            return None
+        module_name, _, attribute = module_name.rpartition(".")
+        attributes.append(attribute)
+    obj = sys.modules[module_name]
+    for attribute in reversed(attributes):
+        obj = getattr(obj, attribute, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def _report_violation(msg):
+    """Issue a warning for a violation of a pydoc, with its stack.
+
+    msg (unicode): the description of the violation.
+
+    """
+    _stats.violations += 1
+    site = getattr(_deferred_site, "site", None)
+    if site is not None:
+        # Checked in the background: the stack is not interesting.
+        msg = "%s\nCalled from `%s', line %d, in `%s'." % ((msg,) + site)
+    if _trace_sinks:
+        _trace("violation", message=msg)
+    _warn(msg)
+    if site is not None:
+        return
+    # Extracting the stack is expensive, do it only if needed.
+    if DEBUG >= 2:
+        for line in traceback.extract_stack():
+            if "pydocchecker" not in str(line):
+                # Avoid logging lines coming from Pydoc Checker.
+                _log("%s", line, level=2)
+
+
+def _report_type_violation(fname, type_, value, name):
+    """Issue a warning for a value not of the expected type.
+
+    fname (unicode): the name of the function/method.
+    type_ (unicode): the name of the expected type.
+    value (object): the value checked.
+    name (unicode): the name of the argument checked.
+
+    """
+    msg1 = "`%s' received value with wrong type for argument `%r'." % (
+        fname, name)
+    msg2 = "Value passed: `%r', of type `%r'." % (
+        value, value.__class__.__name__)
+    msg3 = "Expected type: `%r'." % type_
+    _report_violation("%s\n%s\n%s" % (msg1, msg2, msg3))
+
+
+def _check_exception(fname, raises, error):
+    """Check that the exception raised by a function was expected.
+
+    If the exception is not described in the pydoc, a warning is
+    logged. This is called while handling error, hence it must not
+    raise: the annotation is compiled in advance.
+
+    fname (unicode): the name of the function/method.
+    raises ((unicode, _Checker|None)|None): the names of the expected
+        exceptions and their checker (None if they do not parse, in
+        which case nothing is checked), or None if the pydoc does not
+        describe any exception.
+    error (Exception): the exception raised.
+
+    """
+    type_ = None
+    if raises is not None:
+        type_, checker = raises
+        if checker is None or checker(error):
+            return
+
+    msg1 = "`%s' raised an unexpected exception." % fname
+    msg2 = "Exception raised: `%r', of type `%r'." % (
+        error, error.__class__.__name__)
+    msg3 = "Expected exceptions: `%r'." % type_
+    _report_violation("%s\n%s\n%s" % (msg1, msg2, msg3))
+
+
+def _extract_annotations(doc):
+    """Extract all the type annotations from the pydoc.
+
+    Annotations are the lines of the form "<name> (<type>): ...",
+    where name can be prefixed by the stars of *args and **kwargs. For
+    each name only the first annotation is considered, except for
+    "raise" (or "raises"), that can be repeated to describe each
+    exception separately.
+
+    doc (unicode): the pydoc of the function.
+
+    return ({unicode: unicode}): the expected types indexed by the
+        name of the argument they describe; the type of the return
+        value is indexed by "__return__", the type of the values
+        yielded by "__yield__", and the union of the types of the
+        exceptions by "__raise__".
+
+    """
+    annotations = {}
+    exceptions = []
+    for ret in re.finditer(r"\n *\**(\w+) (\(.*)", doc):
+        name, rest = ret.groups()
+        try:
+            root, _ = _parse_annotation(rest, 1, ")")
+            type_ = root.text
+        except ValueError:
+            # Not a valid type: if at least the brackets match, keep
+            # it, so that the error is reported when compiling it.
+            try:
+                type_ = rest[1:_find_closing_bracket(rest, 0)]
+            except ValueError:
+                continue
+        if name in ("raise", "raises"):
+            exceptions.append(type_)
+        elif name in ("return", "returns"):
+            annotations.setdefault("__return__", type_)
+        elif name in ("yield", "yields"):
+            annotations.setdefault("__yield__", type_)
+        else:
+            annotations.setdefault(name, type_)
+    if len(exceptions) > 0:
+        annotations["__raise__"] = "|".join(exceptions)
+    return _interned(annotations)
+
+
+def _interned(annotations):
+    """Return the annotations with all their strings interned.
+
+    Many functions share the same argument names and types: interning
+    stores each distinct string once in the process.
+
+    annotations ({unicode: unicode}): the annotations of a pydoc.
+
+    return ({unicode: unicode}): the same annotations.
+
+    """
+    return dict((sys.intern(name), sys.intern(type_))
+                for name, type_ in annotations.items())
+
+
+def _pydoc_annotations(doc):
+    """Return the annotations in a pydoc, extracting them only once.
+
+    doc (unicode): the cleaned pydoc of a function.
+
+    return ({unicode: unicode}): the annotations, as returned by
+        _extract_annotations.
+
+    """
+    if doc not in _pydocs:
+        _pydocs[doc] = _extract_annotations(doc)
+    return _pydocs[doc]
+
+
+def _own_annotation_table(cls):
+    """Return the annotations of the methods defined in cls.
+
+    Only the methods in the __dict__ of cls are considered, and each
+    pydoc is parsed once, also if the class has many subclasses.
+
+    cls (type): the class to analyze.
+
+    return ({unicode: {unicode: unicode}}): the annotations (as
+        returned by _extract_annotations) of the methods having a
+        pydoc, indexed by the name of the method.
+
+    """
+    if cls in _own_annotation_tables:
+        return _own_annotation_tables[cls]
+    table = {}
+    for key, value in cls.__dict__.items():
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        if not isinstance(value, types.FunctionType):
+            continue
+        # Not inspect.getdoc, that would already look in the
+        # ancestors.
+        if value.__doc__ is not None:
+            table[key] = _pydoc_annotations(inspect.cleandoc(value.__doc__))
+    _own_annotation_tables[cls] = table
+    return table
+
+
+def _annotation_table(cls):
+    """Return the annotations of the methods of cls, with inheritance.
+
+    The annotations of each method defined in cls are completed with
+    the ones of the same method in the ancestors, following the MRO:
+    if the child does not have a pydoc or does not describe some
+    argument, the pydoc of the closest ancestor describing it is
+    used.
+
+    cls (type): the class to analyze.
+
+    return ({unicode: {unicode: unicode}}): the merged annotations of
+        the methods defined in cls, indexed by the name of the method;
+        methods without any pydoc in the whole hierarchy are missing.
+
+    """
+    if cls in _annotation_tables:
+        return _annotation_tables[cls]
+    table = {}
+    ancestors = [_own_annotation_table(base) for base in cls.__mro__[1:]]
+    for key in cls.__dict__:
+        merged = None
+        own = _own_annotation_table(cls).get(key)
+        if own is not None:
+            merged = dict(own)
+        for ancestor in ancestors:
+            inherited = ancestor.get(key)
+            if inherited is None:
+                continue
+            if merged is None:
+                merged = {}
+            for name, type_ in inherited.items():
+                merged.setdefault(name, type_)
+        if merged is not None:
+            table[key] = merged
+    _annotation_tables[cls] = table
+    return table
+
+
+class _BindingPlan(object):
+    """How to check the calls to a function.
+
+    The plan is computed once when decorating the function, so that at
+    each call the values are matched to their checkers by direct
+    lookups, without considering again the kinds of the parameters.
+    Arguments not passed are not checked, as their default values are
+    checked once at decoration time. The plan is all the wrapper needs
+    besides the function, so that each wrapper keeps only two
+    references in its closure.
+
+    fname (unicode): the name of the function/method.
+    positional ((int, unicode, unicode, _Checker)): index, name, type
+        and checker of the parameters that can be passed by position
+        and have a type annotation.
+    keywords ({unicode: (unicode, _Checker)|None}): type and checker
+        (or None, if not annotated) of the parameters that can be
+        passed by name.
+    varargs ((unicode, _Checker)|None): type and checker for each
+        element of *args, if annotated.
+    first_vararg (int): the index of the first element of *args.
+    varkw ((unicode, _Checker)|None): type and checker for each value
+        of **kwargs, if annotated.
+    returns ((unicode, _Checker)|None): type and checker for the
+        return value (the awaited result, for coroutines), if
+        annotated.
+    yields ((unicode, _Checker)|None): type and checker for the values
+        yielded by asynchronous generators, if annotated.
+    raises ((unicode, _Checker|None)|None): the exceptions the
+        function can raise and their checker (None if the annotation
+        does not parse), if annotated.
+    local_entries ((unicode, unicode, _Checker, object, type|None)):
+        for the hooks engine, name, type, checker, default value (not
+        checked again) and container (list for *args, dict for
+        **kwargs, None otherwise) of the parameters with a type
+        annotation.
+
+    """
+
+    __slots__ = ("fname", "positional", "keywords", "varargs",
+                 "first_vararg", "varkw", "returns", "yields", "raises",
+                 "local_entries")
+
+    def __init__(self, fname, positional, keywords, varargs, first_vararg,
+                 varkw):
+        self.fname = fname
+        self.positional = tuple(positional)
+        self.keywords = keywords
+        self.varargs = varargs
+        self.first_vararg = first_vararg
+        self.varkw = varkw
+        self.returns = None
+        self.yields = None
+        self.raises = None
+        self.local_entries = ()
+
+    def is_empty(self):
+        """Return whether the plan does not check any argument.
+
+        return (bool): True if no argument has a type annotation.
+
+        """
+        return len(self.positional) == 0 and self.varargs is None and \
+            self.varkw is None and \
+            all(entry is None for entry in self.keywords.values())
+
+    def check(self, args, kwargs):
+        """Check the arguments of a call, issuing warnings if wrong.
+
+        args ((object)): the positional arguments of the call.
+        kwargs ({unicode: object}): the keyword arguments of the call.
+
+        """
+        length = len(args)
+        for index, name, type_, checker in self.positional:
+            if index >= length:
+                break
+            if not checker(args[index]):
+                _report_type_violation(self.fname, type_, args[index], name)
+        if self.varargs is not None and length > self.first_vararg:
+            type_, checker = self.varargs
+            for value in args[self.first_vararg:]:
+                if not checker(value):
+                    _report_type_violation(self.fname, type_, value,
+                                           "__args__")
+        if kwargs:
+            keywords = self.keywords
+            for name, value in kwargs.items():
+                if name in keywords:
+                    entry = keywords[name]
+                else:
+                    entry = self.varkw
+                if entry is not None and not entry[1](value):
+                    _report_type_violation(self.fname, entry[0], value, name)
+
+    def check_locals(self, values):
+        """Check the arguments of a call, from the locals of its frame.
+
+        values ({unicode: object}): the local variables of the function
+            when it starts, that is, its parameters.
+
+        """
+        for name, type_, checker, default, container in self.local_entries:
+            value = values[name]
+            if container is None:
+                if value is not default and not checker(value):
+                    _report_type_violation(self.fname, type_, value, name)
+            elif container is list:
+                for item in value:
+                    if not checker(item):
+                        _report_type_violation(self.fname, type_, item,
+                                               "__args__")
+            else:
+                for key, item in value.items():
+                    if not checker(item):
+                        _report_type_violation(self.fname, type_, item, key)
+
+    def check_return(self, value):
+        """Check the return value of a call, issuing a warning if wrong.
+
+        value (object): the value returned by the function.
+
+        """
+        type_, checker = self.returns
+        if not checker(value):
+            _report_type_violation(self.fname, type_, value, "__return__")
+
+    def check_exception(self, error):
+        """Check an exception raised, issuing a warning if unexpected.
+
+        error (Exception): the exception raised by the function.
+
+        """
+        _check_exception(self.fname, self.raises, error)
+
+    def check_yield(self, value):
+        """Check a value yielded, issuing a warning if wrong.
+
+        value (object): the value yielded by the generator.
+
+        """
+        type_, checker = self.yields
+        if not checker(value):
+            _report_type_violation(self.fname, type_, value, "__yield__")
+
+
+class _CoveredBindingPlan(_BindingPlan):
+    """A plan recording in the coverage bitmap that the function was
+    called.
+
+    bits (bytearray): the coverage bitmap.
+    byte (int): the index of the byte of the bit of the function.
+    mask (int): the mask selecting the bit in its byte.
+
+    """
+
+    __slots__ = ("bits", "byte", "mask")
+
+    def __init__(self, *args):
+        _BindingPlan.__init__(self, *args)
+        self.bits = _coverage.bits
+        # Allocated only if the function is decorated.
+        self.byte = 0
+        self.mask = 0
+
+    def check(self, args, kwargs):
+        self.bits[self.byte] |= self.mask
+        _BindingPlan.check(self, args, kwargs)
+
+    def check_locals(self, values):
+        self.bits[self.byte] |= self.mask
+        _BindingPlan.check_locals(self, values)
+
+
+class _Tuning(object):
+    """The state of the auto-tuning of the checks of a function.
+
+    Checked calls are timed, to compare the cost of the checks with the
+    cost of the call; at the end of each window of TUNING_WINDOW calls
+    the function is checked on every call ("on"), on one call in
+    TUNING_SAMPLE_INTERVAL ("sampled") or never ("off"), choosing the
+    most frequent checking within OVERHEAD_BUDGET. Functions whose
+    window lasted more than TUNING_COLD seconds are cold, and are
+    checked on every call again.
+
+    fname (unicode): the name of the function/method.
+    interval (int): check one call in interval, or none if 0.
+    count (int): the calls in the current window.
+    check_time (float): the time spent checking the calls timed in
+        the current window.
+    call_time (float): the time spent in the timed calls.
+    window_start (float): when the current window started.
+
+    """
+
+    __slots__ = ("fname", "interval", "count", "check_time", "call_time",
+                 "window_start")
+
+    def __init__(self, fname):
+        self.fname = fname
+        self.interval = 1
+        self.count = 0
+        self.check_time = 0.0
+        self.call_time = 0.0
+        self.window_start = time.perf_counter()
+
+    @property
+    def mode(self):
+        """The current checking mode: "on", "sampled" or "off"."""
+        return {0: "off", 1: "on"}.get(self.interval, "sampled")
+
+    def end_window(self):
+        """Adapt the checking to the costs measured in the window.
+
+        """
+        now = time.perf_counter()
+        old_mode = self.mode
+        if now - self.window_start > TUNING_COLD:
+            self.interval = 1
+            reason = "cold"
+        elif self.call_time > 0.0:
+            ratio = self.check_time / self.call_time
+            if ratio <= OVERHEAD_BUDGET:
+                self.interval = 1
+            elif ratio / TUNING_SAMPLE_INTERVAL <= OVERHEAD_BUDGET:
+                self.interval = TUNING_SAMPLE_INTERVAL
+            else:
+                self.interval = 0
+            reason = "checks cost %.1f%% of the calls" % (100.0 * ratio)
+        else:
+            reason = None
+        if self.mode != old_mode:
+            _log("Checks of `%s' changed from %s to %s (%s).",
+                 self.fname, old_mode, self.mode, reason, level=3)
+        self.count = 0
+        self.check_time = 0.0
+        self.call_time = 0.0
+        self.window_start = now
+
+
+def _wrapper(func, plan):
+    """Return a wrapper checking all calls to func.
+
+    func (function): the function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return (function): the wrapper.
+
+    """
+    @wraps(func)
+    def internal(*args, **kwargs):
+        """Decorated function."""
+        plan.check(args, kwargs)
+        # The try block costs nothing when func does not raise, so
+        # the common path is not slowed down.
+        try:
+            ret_value = func(*args, **kwargs)
+        except Exception as error:
+            _check_exception(plan.fname, plan.raises, error)
+            raise
+        if plan.returns is not None:
+            plan.check_return(ret_value)
+        return ret_value
+
+    return internal
+
+
+def _coroutine_wrapper(func, plan):
+    """Return a wrapper checking all calls to a coroutine function.
+
+    The wrapper checks the arguments on call, as for other functions
+    (also if the coroutine is awaited later, or never), and returns a
+    coroutine awaiting the original one directly, without creating
+    tasks, and checking the result when it completes. The wrapper is
+    marked as a coroutine function, so that frameworks still
+    recognize it as such.
+
+    func (function): the coroutine function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return (function): the wrapper.
+
+    """
+    @wraps(func)
+    async def checked(coroutine):
+        """Await the original coroutine, checking its result."""
+        try:
+            ret_value = await coroutine
+        except Exception as error:
+            _check_exception(plan.fname, plan.raises, error)
+            raise
+        if plan.returns is not None:
+            plan.check_return(ret_value)
+        return ret_value
+
+    @wraps(func)
+    def internal(*args, **kwargs):
+        """Decorated coroutine function."""
+        plan.check(args, kwargs)
+        return checked(func(*args, **kwargs))
+
+    return _mark_coroutine_function(internal)
+
+
+def _mark_coroutine_function(func):
+    """Mark a function returning coroutines as a coroutine function.
+
+    func (function): the function to mark.
+
+    return (function): func, recognized by inspect (from Python 3.12)
+        and asyncio as a coroutine function.
+
+    """
+    if hasattr(inspect, "markcoroutinefunction"):
+        return inspect.markcoroutinefunction(func)
+    import asyncio.coroutines
+    func._is_coroutine = asyncio.coroutines._is_coroutine
+    return func
+
+
+def _async_generator_wrapper(func, plan):
+    """Return a wrapper checking an asynchronous generator function.
+
+    The wrapper is an asynchronous generator that forwards to the
+    original one the values sent and the exceptions thrown, checking
+    the arguments when it starts and each value yielded.
+
+    func (function): the asynchronous generator function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return (function): the wrapper.
+
+    """
+    @wraps(func)
+    async def internal(*args, **kwargs):
+        """Decorated asynchronous generator function."""
+        plan.check(args, kwargs)
+        generator = func(*args, **kwargs)
+        value = None
+        thrown = None
+        try:
+            while True:
+                try:
+                    if thrown is None:
+                        item = await generator.asend(value)
+                    else:
+                        error, thrown = thrown, None
+                        item = await generator.athrow(error)
+                except StopAsyncIteration:
+                    return
+                except Exception as error:
+                    _check_exception(plan.fname, plan.raises, error)
+                    raise
+                if plan.yields is not None:
+                    plan.check_yield(item)
+                try:
+                    value = yield item
+                except GeneratorExit:
+                    raise
+                except BaseException as error:
+                    value = None
+                    thrown = error
+        finally:
+            await generator.aclose()
+
+    return internal
+
+
+def _enclosing_package(name, packages):
+    """Return the package in packages containing a module.
+
+    name (unicode): the name of a module.
+    packages ([unicode]): the names of some packages.
+
+    return (unicode): the longest package in packages of which name is
+        (a submodule of) a subpackage, or "" if none.
+
+    """
+    ret = ""
+    for package in packages:
+        if len(package) > len(ret) and _to_be_checked(name, [package]):
+            ret = package
+    return ret
+
+
+def _caller_package(frame):
+    """Return the package containing the code running in a frame.
+
+    The result is cached by file and code object (code objects of
+    identical functions compare equal even if they are in different
+    files), so that the name of the module is looked up only for the
+    first call from each function.
+
+    frame (frame): the frame of the caller of a decorated function.
+
+    return (unicode): the checked or trusted package containing the
+        caller, or "" if none.
+
+    """
+    key = (frame.f_code.co_filename, frame.f_code)
+    if key not in _caller_packages:
+        _caller_packages[key] = _enclosing_package(
+            frame.f_globals.get("__name__", ""),
+            _checked_packages + TRUSTED_PACKAGES)
+    return _caller_packages[key]
+
+
+def _boundary_wrapper(func, plan):
+    """Return a wrapper checking only the calls from other packages.
+
+    Calls from the same checked package of func, or from a trusted
+    package, are not checked; the caller is found looking at the
+    previous frame only.
+
+    func (function): the function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return (function): the wrapper.
+
+    """
+    trusted = frozenset(
+        [_enclosing_package(func.__module__, _checked_packages)] +
+        TRUSTED_PACKAGES) - frozenset([""])
+    checked = _wrapper(func, plan)
+    getframe = sys._getframe
+
+    @wraps(func)
+    def internal(*args, **kwargs):
+        """Decorated function, checked at the boundary."""
+        frame = getframe(1)
+        code = frame.f_code
+        caller = _caller_packages.get((code.co_filename, code))
+        if caller is None:
+            caller = _caller_package(frame)
+        if caller in trusted:
+            return func(*args, **kwargs)
+        return checked(*args, **kwargs)
+
+    return internal
+
+
+class _DeferredChecks(object):
+    """The queue of the checks deferred to a background thread.
+
+    queue (queue.Queue): the checks to do, as tuples (function,
+        arguments, call site).
+    thread (threading.Thread): the thread doing them.
+
+    """
+
+    __slots__ = ("queue", "thread")
+
+    def __init__(self):
+        self.queue = queue.Queue(DEFERRED_QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.run,
+                                       name="pydocchecker", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Do the checks in the queue, until stopped.
+
+        """
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            function, args, site = item
+            _deferred_site.site = site
+            try:
+                function(*args)
+            except Exception:
+                _log(traceback.format_exc(), level=2)
+            finally:
+                _deferred_site.site = None
+                self.queue.task_done()
+
+    def stop(self):
+        """Do the checks in the queue, then stop the thread.
+
+        """
+        self.queue.put(None)
+        self.thread.join()
+
+
+# The deferred checks of this process, created at the first use; and
+# the call site of the check being done in the background thread.
+_deferred = None
+_deferred_site = threading.local()
+
+
+def _defer(function, *args):
+    """Run function on args in the background, if the queue has room.
+
+    The values are not copied, so the check sees them as they are when
+    it is done.
+
+    function (function): the check to run.
+    args ([object]): its arguments.
+
+    """
+    global _deferred
+    if _deferred is None:
+        _deferred = _DeferredChecks()
+    # The caller of the decorated function.
+    frame = sys._getframe(2)
+    site = (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+    try:
+        _deferred.queue.put_nowait((function, args, site))
+    except queue.Full:
+        _stats.dropped += 1
+
+
+def _deferred_wrapper(func, plan):
+    """Return a wrapper checking func in the background.
+
+    The return value (and, if DEFERRED is "all", the arguments) are
+    checked by a background thread, so that the caller does not wait
+    for the checks; exceptions are still checked immediately.
+
+    func (function): the function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return (function): the wrapper.
+
+    """
+    defer_arguments = DEFERRED == "all"
+
+    @wraps(func)
+    def internal(*args, **kwargs):
+        """Decorated function, checked in the background."""
+        if defer_arguments:
+            _defer(plan.check, args, kwargs)
+        else:
+            plan.check(args, kwargs)
+        try:
+            ret_value = func(*args, **kwargs)
+        except Exception as error:
+            _check_exception(plan.fname, plan.raises, error)
+            raise
+        if plan.returns is not None:
+            _defer(plan.check_return, ret_value)
+        return ret_value
+
+    return internal
+
+
+def flush_deferred():
+    """Wait until all the checks deferred so far are done.
+
+    """
+    if _deferred is not None:
+        _deferred.queue.join()
+
+
+def stop_deferred():
+    """Do the checks deferred so far, then stop the background thread.
+
+    The next deferred check starts a new thread, with a queue of
+    DEFERRED_QUEUE_SIZE checks.
+
+    """
+    global _deferred
+    if _deferred is not None:
+        deferred, _deferred = _deferred, None
+        deferred.stop()
+
+
+# The source of the trampolines replacing the code of the functions
+# decorated in place; the placeholder is replaced by the copy of the
+# function with the original code, and its binding plan. The
+# trampoline runs with the globals of the decorated function, so it
+# refers only to builtins and to its constants. It must have as many
+# free variables as the function has cells in its closure, hence the
+# references in dead code.
+_TRAMPOLINE_PLACEHOLDER = "__pydc_trampoline__"
+_TRAMPOLINE_SOURCE = """
+def outer():
+    %(assignment)s
+    def trampoline(*args, **kwargs):
+        if False:
+            %(references)s
+        original, plan = "%(placeholder)s"
+        plan.check(args, kwargs)
+        try:
+            ret_value = original(*args, **kwargs)
+        except Exception as error:
+            plan.check_exception(error)
+            raise
+        if plan.returns is not None:
+            plan.check_return(ret_value)
+        return ret_value
+    return trampoline
+"""
+
+
+# Template code of the trampolines, indexed by number of free
+# variables.
+_trampolines = {}
+
+
+def _trampoline_code(func, plan):
+    """Return the code of the trampoline checking the calls to func.
+
+    func (function): the function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return ((code, function)): a code object with the same free
+        variables, name and location of the code of func, checking the
+        calls according to plan and then calling a copy of func with
+        the original code; and that copy.
+
+    """
+    code = func.__code__
+    length = len(code.co_freevars)
+    if length not in _trampolines:
+        names = ["v%d" % i for i in range(length)]
+        namespace = {}
+        exec(_TRAMPOLINE_SOURCE % {
+            "assignment": " = ".join(names + ["None"]),
+            "references": ", ".join(names + ["None"]),
+            "placeholder": _TRAMPOLINE_PLACEHOLDER,
+            }, namespace)
+        _trampolines[length] = namespace["outer"]().__code__
+    template = _trampolines[length]
+
+    original = types.FunctionType(code, func.__globals__, func.__name__,
+                                  func.__defaults__, func.__closure__)
+    original.__kwdefaults__ = func.__kwdefaults__
+    original.__qualname__ = func.__qualname__
+    constants = tuple((original, plan) if constant == _TRAMPOLINE_PLACEHOLDER
+                      else constant for constant in template.co_consts)
+    names = {"co_name": code.co_name}
+    if hasattr(code, "co_qualname"):
+        names["co_qualname"] = code.co_qualname
+    return template.replace(co_consts=constants,
+                            co_filename=code.co_filename,
+                            co_firstlineno=code.co_firstlineno,
+                            **names), original
+
+
+def _patch_in_place(func, plan):
+    """Decorates func replacing its code with a trampoline.
+
+    The function object is kept, so that all references to it (also
+    the ones in containers and other objects) check the calls without
+    being replaced. The signature is preserved in __signature__, and
+    the function with the original code in __wrapped__.
+
+    func (function): the function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return (function): func itself.
+
+    """
+    signature = inspect.signature(func)
+    func.__code__, func.__wrapped__ = _trampoline_code(func, plan)
+    func.__signature__ = signature
+    return func
+
+
+# Flags of the code of the functions that the hooks engine does not
+# check, because they return (or yield) more than once.
+_GENERATOR_FLAGS = inspect.CO_GENERATOR | inspect.CO_COROUTINE | \
+    inspect.CO_ASYNC_GENERATOR | inspect.CO_ITERABLE_COROUTINE
+
+
+# Opcodes returning normally from a function.
+_RETURN_OPCODES = frozenset(dis.opmap[name]
+                            for name in ("RETURN_VALUE", "RETURN_CONST")
+                            if name in dis.opmap)
+
+
+# For the hooks engine, the binding plans indexed by the code of the
+# functions to check.
+_hooked_codes = {}
+
+
+# With sys.monitoring, the tool identifier claimed by the hooks engine,
+# if any.
+_monitoring_tool = None
+
+
+def _hook(func, plan):
+    """Register func to be checked by the hooks engine.
+
+    func (function): the function to check.
+    plan (_BindingPlan): the plan to check its calls.
+
+    return (function): func itself, unchanged.
+
+    """
+    _hooked_codes[func.__code__] = plan
+    return func
+
+
+def _profile_hook(frame, event, arg):
+    """Check the calls to the hooked functions, see sys.setprofile.
 
+    Exceptions are not checked, as the hook does not see them; when a
+    function raises, the hook sees a return of None, recognized
+    looking at the instruction the function stopped at.
 
-# Map of patched functions (to fix references of those functions
-# imported in other modules).
-_decoration_map = {}
+    frame (frame): the frame of the event.
+    event (unicode): the kind of event.
+    arg (object): the value returned, for "return" events.
 
+    """
+    if event == "call":
+        plan = _hooked_codes.get(frame.f_code)
+        if plan is not None:
+            plan.check_locals(frame.f_locals)
+    elif event == "return":
+        plan = _hooked_codes.get(frame.f_code)
+        if plan is not None and plan.returns is not None and \
+                (arg is not None or
+                 frame.f_code.co_code[frame.f_lasti] in _RETURN_OPCODES):
+            plan.check_return(arg)
 
-def _log(msg, level=5):
-    """Log msg with q, if debug is enabled.
 
-    msg (unicode): the message to log
+def _monitoring_start(code, offset):
+    """Check the arguments of a hooked function, see sys.monitoring.
 
-    level (int): the minimum level DEBUG needs to be set in order for
-        this message to be logged. Levels are so organized: do not log
-        anything (0); log the same message that are issued as warnings
-        (1); additional info in case of warnings (2); not used (3);
-        log missing pydoc or type information (4); log all patched
-        functions and found types (5).
+    code (code): the code of the function starting.
+    offset (int): the offset of the instruction.
 
     """
-    if DEBUG >= level:
-        q / msg
+    plan = _hooked_codes.get(code)
+    if plan is None:
+        return sys.monitoring.DISABLE
+    plan.check_locals(sys._getframe(1).f_locals)
 
 
-def _warn(msg):
-    """Issue a warning and if necessary, log.
+def _monitoring_return(code, offset, value):
+    """Check the value returned by a hooked function.
 
-    msg (unicode): the string to log.
+    code (code): the code of the function returning.
+    offset (int): the offset of the instruction.
+    value (object): the value returned.
 
     """
-    warn(msg)
-    _log(msg, level=1)
+    plan = _hooked_codes.get(code)
+    if plan is None:
+        return sys.monitoring.DISABLE
+    if plan.returns is not None:
+        plan.check_return(value)
 
 
-def _describe_function(func):
-    """Return the name of the function or method.
+def _install_hooks():
+    """Start checking the hooked functions.
 
-    func (function): the function.
-    return (unicode): the name of the function.
+    With sys.monitoring (Python 3.12 or later), events are enabled
+    only for the code of the hooked functions, under a tool identifier
+    not used by other tools (preferably one without a predefined use,
+    so that debuggers and profilers like cProfile can still run);
+    otherwise, a profile function is installed for this thread and the
+    ones started later, replacing any other profiler.
+
+    raise (RuntimeError): if all the tool identifiers are in use.
 
     """
-    name = func.__name__
-    if hasattr(func, "im_class"):
-        name = "%s.%s" % (func.im_class.__name__, name)
-    return name
+    global _monitoring_tool
+    if hasattr(sys, "monitoring"):
+        monitoring = sys.monitoring
+        events = monitoring.events
+        if _monitoring_tool is None:
+            for tool in (3, 4, monitoring.OPTIMIZER_ID,
+                         monitoring.PROFILER_ID):
+                if monitoring.get_tool(tool) is None:
+                    monitoring.use_tool_id(tool, "pydocchecker")
+                    _monitoring_tool = tool
+                    break
+            else:
+                raise RuntimeError("Cannot use the hooks engine, all the "
+                                   "sys.monitoring tool identifiers are "
+                                   "in use.")
+        tool = _monitoring_tool
+        monitoring.register_callback(tool, events.PY_START,
+                                     _monitoring_start)
+        monitoring.register_callback(tool, events.PY_RETURN,
+                                     _monitoring_return)
+        for code in _hooked_codes:
+            monitoring.set_local_events(tool, code,
+                                        events.PY_START | events.PY_RETURN)
+    else:
+        sys.setprofile(_profile_hook)
+        threading.setprofile(_profile_hook)
 
 
-def _find_closing_bracket(string, index):
-    """Return the index of the bracket matching the one at index.
+def _remove_hooks():
+    """Stop checking the hooked functions, and forget them.
 
-    string (unicode): the string to analyze.
-    index (int): the index in string of the open bracket to match.
+    """
+    global _monitoring_tool
+    if _monitoring_tool is not None:
+        monitoring = sys.monitoring
+        tool, _monitoring_tool = _monitoring_tool, None
+        if monitoring.get_tool(tool) == "pydocchecker":
+            for code in _hooked_codes:
+                monitoring.set_local_events(tool, code, 0)
+            for event in (monitoring.events.PY_START,
+                          monitoring.events.PY_RETURN):
+                monitoring.register_callback(tool, event, None)
+            monitoring.free_tool_id(tool)
+    elif sys.getprofile() is _profile_hook:
+        sys.setprofile(None)
+        threading.setprofile(None)
+    _hooked_codes.clear()
+
+
+def _tuned_wrapper(func, plan):
+    """Return a wrapper checking func within OVERHEAD_BUDGET.
 
-    return (int): the index in string of the matching bracket.
+    func (function): the function to decorate.
+    plan (_BindingPlan): the plan to check its calls.
 
-    raise (ValueError): if the brackets are not well matched, or if
-        index is invalid.
+    return (function): the wrapper.
 
     """
-    bracket_error = ValueError("Brackets not well matched.")
-    if not 0 <= index < len(string) or string[index] not in BRACKETS:
-        raise ValueError("Invalid index.")
-    waiting_for = BRACKETS[string[index]]
-    cur = index + 1
-    depth = []
-    while cur < len(string):
-        char = string[cur]
-        if char in BRACKETS:
-            depth.append(BRACKETS[char])
-        elif char in BRACKETS.values():
-            if len(depth) == 0:
-                if char == waiting_for:
-                    return cur
-                else:
-                    raise bracket_error
-            else:
-                if char == depth[-1]:
-                    depth = depth[:-1]
-                else:
-                    raise bracket_error
-        cur += 1
-    raise bracket_error
+    tuning = _Tuning(plan.fname)
+    _tunings.append(tuning)
+    perf_counter = time.perf_counter
 
+    @wraps(func)
+    def internal(*args, **kwargs):
+        """Decorated function, checked adaptively."""
+        tuning.count += 1
+        if tuning.count >= TUNING_WINDOW:
+            tuning.end_window()
+        if tuning.interval == 0 or tuning.count % tuning.interval != 0:
+            return func(*args, **kwargs)
+        start = perf_counter()
+        plan.check(args, kwargs)
+        middle = perf_counter()
+        try:
+            ret_value = func(*args, **kwargs)
+        except Exception as error:
+            _check_exception(plan.fname, plan.raises, error)
+            raise
+        end = perf_counter()
+        if plan.returns is not None:
+            plan.check_return(ret_value)
+        tuning.check_time += middle - start + perf_counter() - end
+        tuning.call_time += end - middle
+        return ret_value
 
-def _smart_split(string, char):
-    """Split string in correspondence of char, considering brackets.
+    return internal
 
-    This functions splits string at char, when it occurres at depth
-    zero, i.e. when it is not inside a bracket. Tokens composed only
-    of whitespaced will not be included in the output.
 
-    string (unicode): the string to analyze.
-    char (unicode): the char to split at.
+def _compile_annotation(fname, type_, argument=None):
+    """Compile a type annotation, warning if it is not valid.
 
-    return ([unicode]): the splitted string.
+    fname (unicode): the name of the function/method.
+    type_ (unicode|None): the type annotation, or None if missing.
+    argument (unicode|None): the argument annotated, if its branches
+        are to be recorded in the coverage bitmap (when enabled).
 
-    raise (ValueError): when char is not of length one.
+    return (_Checker|None): the checker for type_, or None if type_ is
+        None or does not parse.
 
     """
-    if len(char) != 1:
-        raise ValueError("char must be of length one.")
-    depth = 0
-    ret = []
-    prev = -1
-    for idx, cur in enumerate(string):
-        if cur in BRACKETS:  # Opening brackets
-            depth += 1
-        elif cur in BRACKETS.values():  # Closing brackets.
-            depth -= 1
-        elif cur == char:
-            if depth == 0:
-                to_append = string[prev + 1:idx].strip()
-                if to_append != "":
-                    ret.append(to_append)
-                prev = idx
-    to_append = string[prev + 1:].strip()
-    if to_append != "":
-        ret.append(to_append)
-    return ret
+    if type_ is None:
+        return None
+    try:
+        checker = _check(type_)
+    except ValueError as error:
+        _warn("Unable to parse type annotation in `%s'. %s" % (fname, error))
+        return None
+    if COVERAGE and argument is not None:
+        checker = _covered_checker(fname, argument, type_)
+    return checker
 
 
-def _check(type_):
-    """Return a function checking that an object is of a certain type.
+def _covered_checker(fname, argument, type_):
+    """Return a checker recording the branches of an annotation hit.
 
-    type_ (unicode): the name of the type to resolve.
+    Unions and records, and the checkers containing them, are compiled
+    again for each argument, each with its own bits in the coverage
+    bitmap; the other subtrees are shared with all annotations.
 
-    return (function): a function accepting an object and returning
-        True if the object is of type type_, and False otherwise.
+    fname (unicode): the name of the function/method.
+    argument (unicode): the argument annotated.
+    type_ (unicode): the annotation, already compiled once.
 
-    raise (ValueError): if the type description is invalid (does not
-        parse).
+    return (_Checker): the checker for type_.
 
     """
-    type_ = type_.strip()
-
-    if type_ == "":
-        return lambda x: True
-
-    or_splits = _smart_split(type_, "|")
-    if len(or_splits) > 1:
-        return lambda obj: \
-            any(_check(or_split)(obj)
-                for or_split in or_splits)
+    root, _ = _parse_annotation(type_)
+    covered = {}
+    # The ids of the nodes whose checker is not shared.
+    own = set()
+    stack = [(root, False)]
+    while len(stack) > 0:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children)
+            continue
+        children = [covered[id(child)] for child in node.children]
+        if node.kind == "union":
+            marks = [_coverage.allocate(fname, argument, type_, child.text)
+                     for child in node.children]
+            covered[id(node)] = _CoveredUnionChecker(children, marks)
+        elif node.kind == "record":
+            marks = dict(
+                (key, _coverage.allocate(
+                    fname, argument, type_, "'%s'%s: %s" % (
+                        key, "?" if key in node.optional else "",
+                        child.text)))
+                for key, child in zip(node.keys, node.children))
+            covered[id(node)] = _CoveredRecordChecker(
+                zip(node.keys, children), node.optional, marks)
+        elif not any(id(child) in own for child in node.children):
+            covered[id(node)] = _shared_checker(node, children)
+            continue
+        else:
+            covered[id(node)] = _compile_checker(node, children)
+        own.add(id(node))
+    return covered[id(root)]
 
-    if type_[0] in BRACKETS:
-        end = _find_closing_bracket(type_, 0)
-        if end != len(type_) - 1:
-            raise ValueError("Syntax error in type `%s'." % type_)
 
-        if type_[0] == "[":
+def _element_checker(checker, container):
+    """Return the checker for the elements of *args or **kwargs.
 
-            def check_list(obj):
-                """Check that obj is a valid list."""
-                if obj is None:
-                    return NONE_ALWAYS_VALID
-                if not isinstance(obj, list):
-                    return False
-                for item in obj:
-                    if not _check(type_[1:-1])(item):
-                        return False
-                return True
+    *args and **kwargs are described as the list or dict they would
+    be if passed explicitly, but any other annotation is accepted
+    and applied to each element.
 
-            return check_list
+    checker (_Checker): the checker for the whole annotation.
+    container (type): list for *args, dict for **kwargs.
 
-        elif type_[0] == "(":
-            items_type = _smart_split(type_[1:-1], ",")
+    return (_Checker): the checker to apply to each element (for
+        *args) or value (for **kwargs).
 
-            def check_tuple(obj):
-                """Check that obj is a valid tuple."""
-                if obj is None:
-                    return NONE_ALWAYS_VALID
-                if not isinstance(obj, tuple):
-                    return False
-                if len(items_type) != len(obj):
-                    return False
-                for item, item_type in zip(obj, items_type):
-                    if not _check(item_type)(item):
-                        return False
-                return True
+    """
+    if container is list and isinstance(checker, _ListChecker):
+        return checker.item
+    if container is dict and isinstance(checker, _DictChecker):
+        return checker.value
+    return checker
 
-            return check_tuple
 
-        elif type_[0] == "<":
+def _describe_type(value, depth=0):
+    """Return an annotation describing the type of a value.
 
-            def check_set(obj):
-                """Check that obj is a valid set."""
-                if obj is None:
-                    return NONE_ALWAYS_VALID
-                if not isinstance(obj, set):
-                    return False
-                for item in obj:
-                    if not _check(type_[1:-1])(item):
-                        return False
-                return True
+    Containers are described together with the types of (a sample of)
+    their items, up to PROFILE_DEPTH levels.
 
-            return check_set
-
-        else:  # type_[0] == "{"
-            keyvalues = [_smart_split(keyvalue, ":")
-                         for keyvalue in _smart_split(type_[1:-1], ",")]
-            # Heuristic: if there is only one key-value, we assume it
-            # is of the form "{type_of_key: type_of_value}";
-            # otherwise, of the form "{name_of_key: type_of_value,
-            # ...}".
-            if len(keyvalues) == 1:
-
-                def check_dict(obj):
-                    """Check that obj is a valid dict."""
-                    if obj is None:
-                        return NONE_ALWAYS_VALID
-                    if not isinstance(obj, dict):
-                        return False
-                    if len(keyvalues[0]) != 2:
-                        _warn("Unable to parse type annotation `%s'." % type_)
-                        return True
-                    key_type, value_type = keyvalues[0]
-                    for key, value in obj.iteritems():
-                        if not _check(key_type)(key):
-                            return False
-                        if not _check(value_type)(value):
-                            return False
-                    return True
+    value (object): the value to describe.
+    depth (int): the level of value in the outermost container.
 
-            else:
+    return (unicode): an annotation accepting value.
 
-                def check_dict(obj):
-                    """Check that obj is a valid dict."""
-                    if obj is None:
-                        return NONE_ALWAYS_VALID
-                    if not isinstance(obj, dict):
-                        return False
-                    for keyvalue in keyvalues:
-                        if len(keyvalue) != 2:
-                            _warn("Unable to parse type annotation `%s'." %
-                                  type_)
-                            continue
-                        key, value = keyvalue
-                        if key not in obj:
-                            return False
-                        if not _check(value)(obj[key]):
-                            return False
-                    return True
-
-            return check_dict
-    else:
-        # Simple type.
-        if type_ in TYPES:
-
-            def check_known_type(obj):
-                """Check that obj is a valid known type."""
-                for equivalent_type in TYPES[type_]:
-                    # An equivalent type is either a proper type or a
-                    # function whose return value on the type to be
-                    # checked is its correctness.
-                    if isinstance(equivalent_type, types.FunctionType):
-                        if equivalent_type(obj):
-                            return True
-                    else:
-                        if isinstance(obj, equivalent_type):
-                            return True
-                if obj is None:
-                    return NONE_ALWAYS_VALID
-                return False
+    """
+    cls = type(value)
+    if value is None:
+        return "None"
+    if depth < PROFILE_DEPTH:
+        if cls is list:
+            return "[%s]" % _describe_items(value, depth + 1)
+        elif cls in (set, frozenset):
+            return "<%s>" % _describe_items(value, depth + 1)
+        elif cls is dict:
+            if len(value) == 0:
+                return "{}"
+            return "{%s: %s}" % (_describe_items(value.keys(), depth + 1),
+                                 _describe_items(value.values(), depth + 1))
+        elif cls is tuple and len(value) <= PROFILE_SAMPLE:
+            return "(%s)" % ", ".join(_describe_type(item, depth + 1)
+                                      for item in value)
+    return cls.__name__
+
+
+def _describe_items(items, depth):
+    """Return an annotation describing the types of some items.
+
+    items (iterable): the items of a container, of which only the
+        first PROFILE_SAMPLE are looked at.
+    depth (int): the level of the items in the outermost container.
+
+    return (unicode): the union of the types of the items, or the empty
+        annotation if they have too many different types.
 
-            return check_known_type
-        else:
-            try:
-                # Otherwise try to evaluate the string.
-                real_type = eval(type_)
-            except Exception:
-                # Should be just NameError, but we try to be more
-                # conservative given the eval.
-                return lambda obj: True
-            else:
-                # TODO: if real_type is not a type, this crashes.
-                # eval succeeded, testing with resulting type.
-                return lambda obj: isinstance(obj, real_type) \
-                    or (obj is None and NONE_ALWAYS_VALID)
+    """
+    descriptions = set(_describe_type(item, depth)
+                       for item in itertools.islice(items, PROFILE_SAMPLE))
+    if len(descriptions) > PROFILE_MAX_TYPES:
+        return ""
+    return "|".join(sorted(descriptions))
 
 
-def _check_type(fname, type_, value, name):
-    """Check that the value is of the given type.
+class _Profile(object):
+    """The types observed in the calls to a function.
 
-    If the types do not match, a warning is logged.
+    For each argument (and for the return value and the exceptions,
+    as "__return__" and "__raise__") an histogram of the descriptions
+    of the types of the values is kept, with at most PROFILE_MAX_TYPES
+    entries.
 
     fname (unicode): the name of the function/method.
-    type_ (unicode): the name of the type.
-    value (object): the value to check.
-    name (unicode): the name of the argument to check.
+    documented ({unicode: unicode}): the annotations in the pydoc.
+    checkers ({unicode: _Checker}): the checkers of the annotations
+        that parse, applied to the elements for *args and **kwargs.
+    positional ((unicode)): the names of the parameters that can be
+        passed by position.
+    keywords ({unicode}): the names of the parameters that can be
+        passed by name.
+    varargs (unicode|None): the name of *args, if any.
+    varkw (unicode|None): the name of **kwargs, if any.
+    calls (int): the number of calls.
+    counts ({unicode: {unicode: int}}): for each argument, the number
+        of values observed for each type description.
+    others ({unicode: int}): for each argument, the number of values
+        whose type description did not fit in counts.
+    rejected ({unicode: int}): for each argument, the number of values
+        refused by the checker of its annotation.
 
     """
-    if type_ is None:
-        # No information in the pydoc about this argument.
-        return
 
-    checker = _check(type_)
-    if checker is None:
-        _warn("Not found: %s in %s" % (type_, fname))
-    elif not checker(value):
-        msg1 = "`%s' received value with wrong type for argument `%r'." % (
-            fname, name)
-        msg2 = "Value passed: `%r', of type `%r'." % (
-            value, value.__class__.__name__)
-        msg3 = "Expected type: `%r'." % type_
-        _warn("%s\n%s\n%s" % (msg1, msg2, msg3))
-        for line in traceback.extract_stack():
-            if "pydocchecker" not in str(line):
-                # Avoid logging lines coming from Pydoc Checker.
-                _log(line, level=2)
+    __slots__ = ("fname", "documented", "checkers", "positional",
+                 "keywords", "varargs", "varkw", "calls", "counts",
+                 "others", "rejected")
+
+    def __init__(self, fname, parameters, annotations):
+        self.fname = fname
+        self.documented = annotations
+        self.checkers = {}
+        positional = []
+        self.keywords = set()
+        self.varargs = None
+        self.varkw = None
+        for parameter in parameters:
+            name = parameter.name
+            checker = _compile_annotation(fname, annotations.get(name))
+            if parameter.kind == parameter.VAR_POSITIONAL:
+                self.varargs = name
+                if checker is not None:
+                    checker = _element_checker(checker, list)
+            elif parameter.kind == parameter.VAR_KEYWORD:
+                self.varkw = name
+                if checker is not None:
+                    checker = _element_checker(checker, dict)
+            else:
+                if parameter.kind in (parameter.POSITIONAL_ONLY,
+                                      parameter.POSITIONAL_OR_KEYWORD):
+                    positional.append(name)
+                if parameter.kind != parameter.POSITIONAL_ONLY:
+                    self.keywords.add(name)
+            if checker is not None:
+                self.checkers[name] = checker
+        for name in ("__return__", "__raise__"):
+            checker = _compile_annotation(fname, annotations.get(name))
+            if checker is not None:
+                self.checkers[name] = checker
+        self.positional = tuple(positional)
+        self.calls = 0
+        self.counts = {}
+        self.others = {}
+        self.rejected = {}
+
+    def record(self, name, value):
+        """Record the type of a value.
+
+        name (unicode): the argument the value was passed as.
+        value (object): the value.
+
+        """
+        description = _describe_type(value)
+        counts = self.counts.setdefault(name, {})
+        if description in counts:
+            counts[description] += 1
+        elif len(counts) < PROFILE_MAX_TYPES:
+            counts[description] = 1
+        else:
+            self.others[name] = self.others.get(name, 0) + 1
+        checker = self.checkers.get(name)
+        if checker is not None and not checker(value):
+            self.rejected[name] = self.rejected.get(name, 0) + 1
+
+    def record_call(self, args, kwargs):
+        """Record the types of the arguments of a call.
+
+        args ((object)): the positional arguments of the call.
+        kwargs ({unicode: object}): the keyword arguments of the call.
+
+        """
+        self.calls += 1
+        for name, value in zip(self.positional, args):
+            self.record(name, value)
+        if self.varargs is not None:
+            for value in args[len(self.positional):]:
+                self.record(self.varargs, value)
+        for name, value in kwargs.items():
+            if name in self.keywords:
+                self.record(name, value)
+            elif self.varkw is not None:
+                self.record(self.varkw, value)
+
+    def proposal(self, name):
+        """Return the annotation matching the values observed.
+
+        name (unicode): the argument to describe.
+
+        return (unicode): the union of the types observed, in the form
+            required for the argument (for example, a list for
+            *args), or "object" if they were too many to record.
+
+        """
+        counts = self.counts[name]
+        if self.others.get(name, 0) > 0:
+            type_ = "object"
+        else:
+            type_ = "|".join(sorted(counts, key=lambda key: -counts[key]))
+        if name == self.varargs:
+            type_ = "[%s]" % type_
+        elif name == self.varkw:
+            type_ = "{str: %s}" % type_
+        root, _ = _parse_annotation(type_)
+        return root.text
 
 
-def _extract_expected_type(doc, name):
-    """Try to extract the extected type of an argument from the pydoc.
+def _profile_function(func, fname, parameters, annotations):
+    """Decorates the function to record the types of its arguments.
 
-    doc__ (unicode): the pydoc of the function.
-    name__ (unicode): the name of an argument.
+    func (function): the function to decorate.
+    fname (unicode): the name of the function/method.
+    parameters ([inspect.Parameter]): the parameters of func.
+    annotations ({unicode: unicode}): the annotations in the pydoc.
 
-    return (unicode): the name of the expected type of the argument,
-        or None if could not extract.
+    return (function): the decorated function.
 
     """
-    ret = re.search(r"\n *%s (\(.*)" % name, doc)
-    if ret is not None:
+    profile = _Profile(fname, parameters, annotations)
+    _profiles.append(profile)
+
+    @wraps(func)
+    def internal(*args, **kwargs):
+        """Profiled function."""
+        profile.record_call(args, kwargs)
         try:
-            end = _find_closing_bracket(ret.groups()[-1], 0)
-        except ValueError:
-            # Unable to parse type.
-            return None
-        else:
-            return ret.groups()[-1][1:end]
-    else:
-        return None
+            ret_value = func(*args, **kwargs)
+        except Exception as error:
+            profile.record("__raise__", error)
+            raise
+        profile.record("__return__", ret_value)
+        return ret_value
+
+    _decoration_map[id(func)] = internal
+    internal.__pydc_patched__ = True
+
+    return internal
 
 
-def _decorate_function(func):
+def _decorate_function(func, annotations=None):
     """Decorates the function to check for arguments' types.
 
     func (function): the function to decorate.
+    annotations ({unicode: unicode}|None): the annotations to use, as
+        returned by _extract_annotations, or None to extract them
+        from the pydoc of func.
+
     return (function): the decorated function.
 
     """
     fname = _describe_function(func)
-    _log("Patching function `%s'." % fname, level=5)
 
-    # If there is no pydoc, then there is nothing to do.
-    doc = inspect.getdoc(func)
-    if doc is None:
-        msg = "Missing pydoc for `%s'." % fname
+    # Checked before anything expensive, as functions decorated by a
+    # previous call to check_all are found again.
+    if "__pydc_patched__" in getattr(func, "__dict__", ()):
+        _log("Function already patched: %s", fname, level=4)
+        return func
+
+    _log("Patching function `%s'.", fname, level=5)
+
+    if annotations is None:
+        doc = inspect.getdoc(func)
+        if doc is not None:
+            annotations = _pydoc_annotations(doc)
+
+    # If there is no pydoc, then there is nothing to do (unless we
+    # are profiling, to learn what the pydoc should be).
+    if annotations is None:
+        msg = "Missing pydoc for `%s'."
         if COMPLAIN_FOR_MISSING_PYDOC:
-            _warn(msg)
+            _warn(msg % fname)
         else:
-            _log(msg, level=4)
-        return func
+            _log(msg, fname, level=4)
+        if not PROFILE:
+            return func
+        annotations = {}
 
     # Retrieve arguments data.
-    try:
-        arg_names, _, _, defaults = inspect.getargspec(func)
-    except TypeError:
+    if not isinstance(func, types.FunctionType):
         # Maybe it's not Python code; in that case, do nothing.
         return func
-    # defaults refers to the last len(defaults) arguments.
-    if defaults is None:
-        defaults = []
-    displacement = len(arg_names) - len(defaults)
-
-    if "__pydc_patched__" in func.__dict__:
-        _log("Function already patched: %s" % fname, level=4)
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
         return func
 
-    arg_types = []
-    for i, name in enumerate(arg_names):
-        # Try to get the expected type from the pydoc.
-        type_ = _extract_expected_type(doc, name)
+    if PROFILE:
+        return _profile_function(func, fname, parameters, annotations)
+
+    # Compute the binding plan; parameters are ordered by kind: first
+    # the positional-only ones, then the ones that can be passed both
+    # by position and by name, then *args, the keyword-only ones, and
+    # **kwargs.
+    positional = []
+    keywords = {}
+    varargs = None
+    first_vararg = 0
+    varkw = None
+    local_entries = []
+    for i, parameter in enumerate(parameters):
+        name = parameter.name
+        type_ = annotations.get(name)
+        checker = _compile_annotation(fname, type_, name)
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            if checker is not None:
+                varargs = (type_, _element_checker(checker, list))
+                local_entries.append((name, type_, varargs[1], None, list))
+            continue
+        if parameter.kind == parameter.VAR_KEYWORD:
+            if checker is not None:
+                varkw = (type_, _element_checker(checker, dict))
+                local_entries.append((name, type_, varkw[1], None, dict))
+            continue
+        if checker is not None:
+            local_entries.append((name, type_, checker, parameter.default,
+                                  None))
+
         # If the type is not specified (and this is not the first
         # argument of a method), maybe warn.
         if type_ is None and (name != "self" or i != 0):
-            msg = "Missing type information for argument `%s' in `%s'." % (
-                name, fname)
+            msg = "Missing type information for argument `%s' in `%s'."
             if COMPLAIN_FOR_MISSING_PYDOC:
-                _warn(msg)
+                _warn(msg % (name, fname))
             else:
-                _log(msg, level=4)
-        arg_types.append(type_)
-        # If the argument has a default value, check its type.
-        if i - displacement >= 0:
-            _check_type(fname, type_, defaults[i - displacement], name)
+                _log(msg, name, fname, level=4)
+        # If the argument has a default value, check its type (without
+        # recording it in the coverage bitmap).
+        if checker is not None and \
+                parameter.default is not parameter.empty and \
+                not _check(type_)(parameter.default):
+            _report_type_violation(fname, type_, parameter.default, name)
+
+        if parameter.kind in (parameter.POSITIONAL_ONLY,
+                              parameter.POSITIONAL_OR_KEYWORD):
+            first_vararg = i + 1
+            if checker is not None:
+                positional.append((i, name, type_, checker))
+        if parameter.kind != parameter.POSITIONAL_ONLY:
+            keywords[name] = None if checker is None else (type_, checker)
+    plan_class = _CoveredBindingPlan if COVERAGE else _BindingPlan
+    plan = plan_class(fname, positional, keywords, varargs, first_vararg,
+                      varkw)
 
     # Install the checker also for the return value.
-    ret_type = _extract_expected_type(doc, "return")
-    if ret_type is None:
-        ret_type = _extract_expected_type(doc, "returns")
-
-    @wraps(func)
-    def internal(*args, **kwargs):
-        """Decorated function."""
-        for i, name in enumerate(arg_names):
-            if i < len(args):
-                _check_type(fname, arg_types[i], args[i], name)
-            elif name in kwargs:
-                _check_type(fname, arg_types[i], kwargs[name], name)
-        ret_value = func(*args, **kwargs)
-        _check_type(fname, ret_type, ret_value, "__return__")
-        return ret_value
+    ret_type = annotations.get("__return__")
+    ret_checker = _compile_annotation(fname, ret_type, "__return__")
+    if ret_checker is not None:
+        plan.returns = (ret_type, ret_checker)
+    yield_type = annotations.get("__yield__")
+    yield_checker = _compile_annotation(fname, yield_type, "__yield__")
+    if yield_checker is not None:
+        plan.yields = (yield_type, yield_checker)
+
+    # And for the exceptions, but only if the pydoc has at least one
+    # type annotation: otherwise it is likely that the author did not
+    # care to describe the exceptions either; in that case there is
+    # nothing to check, and no wrapper is needed.
+    raise_type = annotations.get("__raise__")
+    if raise_type is not None:
+        plan.raises = (raise_type, _compile_annotation(fname, raise_type))
+    if plan.raises is None and ret_type is None and yield_type is None and \
+            plan.is_empty():
+        return func
+    if COVERAGE:
+        plan.byte, plan.mask = _coverage.allocate(fname)
+
+    # Hooked functions are not modified, nor marked as patched, as
+    # the hooks are removed by the next call to check_all.
+    if ENGINE == "hooks" and not func.__code__.co_flags & _GENERATOR_FLAGS:
+        plan.local_entries = tuple(local_entries)
+        return _hook(func, plan)
+
+    if inspect.iscoroutinefunction(func):
+        internal = _coroutine_wrapper(func, plan)
+    elif inspect.isasyncgenfunction(func):
+        internal = _async_generator_wrapper(func, plan)
+    elif OVERHEAD_BUDGET is not None:
+        internal = _tuned_wrapper(func, plan)
+    elif BOUNDARY_ONLY:
+        internal = _boundary_wrapper(func, plan)
+    elif DEFERRED is not None:
+        internal = _deferred_wrapper(func, plan)
+    elif IN_PLACE:
+        internal = _patch_in_place(func, plan)
+    else:
+        internal = _wrapper(func, plan)
 
-    # Record in the decoration map
+    # Record in the decoration map (functions patched in place do not
+    # need their references fixed).
     global _decoration_map
-    _decoration_map[id(func)] = internal
+    if internal is not func:
+        _decoration_map[id(func)] = internal
 
     # Set a tracking flag in the new function
     internal.__pydc_patched__ = True
@@ -475,6 +3193,39 @@ def _decorate_function(func):
     return internal
 
 
+def _decorate_descriptor(value, annotations):
+    """Decorates the functions in an attribute of a class.
+
+    Functions are decorated directly; static and class methods are
+    replaced by a descriptor of the same type around the decorated
+    function, so that calls go through a single wrapper; properties
+    by a property with the decorated accessors, each checked
+    according to its own pydoc.
+
+    value (object): the value in the __dict__ of the class.
+    annotations ({unicode: unicode}|None): the annotations of the
+        method, as returned by _annotation_table.
+
+    return (object): the decorated value, or value itself if there
+        is nothing to decorate.
+
+    """
+    if isinstance(value, types.FunctionType):
+        return _decorate_function(value, annotations)
+    elif isinstance(value, (staticmethod, classmethod)):
+        func = _decorate_function(value.__func__, annotations)
+        if func is not value.__func__:
+            return type(value)(func)
+    elif isinstance(value, property):
+        accessors = [value.fget, value.fset, value.fdel]
+        decorated = [accessor if accessor is None
+                     else _decorate_function(accessor)
+                     for accessor in accessors]
+        if decorated != accessors:
+            return type(value)(*decorated, doc=value.__doc__)
+    return value
+
+
 def _decorate_class(cls):
     """Decorates all the methods in cls.
 
@@ -483,10 +3234,12 @@ def _decorate_class(cls):
     return (type): the class with the method decorated.
 
     """
-    _log("Patching class %s." % cls.__name__, level=5)
-    for key, value in cls.__dict__.iteritems():
-        if callable(value):
-            setattr(cls, key, _decorate_function(getattr(cls, key)))
+    _log("Patching class %s.", cls.__name__, level=5)
+    table = _annotation_table(cls)
+    for key, value in list(cls.__dict__.items()):
+        decorated = _decorate_descriptor(value, table.get(key))
+        if decorated is not value:
+            setattr(cls, key, decorated)
     return cls
 
 
@@ -510,74 +3263,317 @@ def _to_be_checked(package, packages):
     return False
 
 
-def _decorate_packages(packages):
-    """Decorate with type checking all requested packages.
+def _checked_objects(packages):
+    """Return the classes and functions to decorate.
+
+    packages ([unicode]): list of packages to decorate (including
+        subpackages).
+
+    return ([(module, unicode, type|function)]): the module, the name
+        in the module, and the object itself, for all classes and
+        functions defined in the requested packages.
+
+    """
+    ret = []
+    for name, module in _checked_modules(packages):
+        ret.extend(_module_objects(name, module))
+    return ret
+
+
+def _checked_modules(packages):
+    """Return the loaded modules to decorate.
 
     packages ([unicode]): list of packages to decorate (including
         subpackages).
 
+    return ([(unicode, module)]): the name and the module of all the
+        loaded modules in the requested packages.
+
     """
-    for name, module in sys.modules.iteritems():
-        if module is None:
+    ret = []
+    for name, module in list(sys.modules.items()):
+        # Some libraries put other objects in sys.modules.
+        if not isinstance(module, types.ModuleType):
             continue
-        if not _to_be_checked(name, packages):
+        if _to_be_checked(name, packages):
+            ret.append((name, module))
+    return ret
+
+
+def _module_objects(name, module):
+    """Return the classes and functions defined in a module.
+
+    name (unicode): the name of the module.
+    module (module): the module.
+
+    return ([(module, unicode, type|function)]): the module, the name
+        in the module, and the object itself, for all classes and
+        functions defined in the module.
+
+    """
+    ret = []
+    for key, value in list(module.__dict__.items()):
+        if not hasattr(value, "__module__") or \
+                value.__module__ != name:
             continue
-        to_add = {}
-        for key, value in module.__dict__.iteritems():
-            if not hasattr(value, "__module__") or \
-                    value.__module__ != name:
+        if isinstance(value, type):
+            ret.append((module, key, value))
+        elif isinstance(value, types.FunctionType):
+            if name == __name__:
                 continue
-            if isinstance(value, type):
-                to_add[key] = _decorate_class(value)
-            elif isinstance(value, types.FunctionType):
-                if name == __name__:
-                    continue
-                to_add[key] = _decorate_function(value)
-        module.__dict__.update(to_add)
+            ret.append((module, key, value))
+    return ret
+
+
+def _record_modules(names):
+    """Remember the state of some modules after their decoration.
+
+    names ([unicode]): the names of the modules to remember.
+
+    """
+    for name in names:
+        module = sys.modules[name]
+        _module_states[name] = tuple(
+            value for _, _, value in _module_objects(name, module))
+
+
+def _changed_modules(packages):
+    """Return the modules changed since their last decoration.
+
+    A module is changed if some of the functions and classes it
+    defines is not the one seen after its last decoration (for
+    example, because the module was reloaded); they are compared by
+    identity, so the cost does not depend on their size. Modules not
+    loaded anymore are forgotten.
+
+    packages ([unicode]): list of packages to decorate (including
+        subpackages).
+
+    return ([unicode]): the names of the modules changed, or loaded
+        after the last decoration.
+
+    """
+    changed = []
+    loaded = set()
+    for name, module in _checked_modules(packages):
+        loaded.add(name)
+        state = _module_states.get(name)
+        values = [value for _, _, value in _module_objects(name, module)]
+        if state is None or len(state) != len(values) or \
+                not all(map(operator.is_, state, values)):
+            changed.append(name)
+    for name in list(_module_states):
+        if name not in loaded:
+            _forget_module(name)
+    return changed
+
+
+def _forget_module(name):
+    """Discard what was recorded about the old version of a module.
+
+    The classes it defined are removed from the known types and from
+    the caches of the annotations, and its functions from the
+    decoration map and from the hooked functions.
+
+    name (unicode): the name of the module.
+
+    return ([type]): the classes the module defined.
+
+    """
+    state = _module_states.pop(name, ())
+    classes = [value for value in state if isinstance(value, type)]
+    for cls in classes:
+        _own_annotation_tables.pop(cls, None)
+        _annotation_tables.pop(cls, None)
+        entries = _class_index.get(cls.__name__, [])
+        entries[:] = [entry for entry in entries if entry[0] != name]
+    for key, internal in list(_decoration_map.items()):
+        if internal.__module__ == name:
+            del _decoration_map[key]
+    filename = getattr(sys.modules.get(name), "__file__", None)
+    for code in list(_hooked_codes):
+        if code.co_filename == filename:
+            del _hooked_codes[code]
+    return classes
+
+
+def _upgrade_checkers(replaced):
+    """Make the compiled checkers refer to the reloaded classes.
+
+    The checkers are modified in place, so that all the wrappers
+    using them are upgraded without compiling them again.
+
+    replaced ({type: type}): the new version of each class replaced.
+
+    """
+    checkers = list(_checkers.values())
+    checkers.extend(checker.resolved for checker in checkers
+                    if isinstance(checker, _PendingChecker) and
+                    checker.resolved is not None)
+    for checker in checkers:
+        if isinstance(checker, _TypeChecker):
+            if isinstance(checker.type_, tuple):
+                checker.type_ = tuple(replaced.get(cls, cls)
+                                      for cls in checker.type_)
+            else:
+                checker.type_ = replaced.get(checker.type_, checker.type_)
+        elif isinstance(checker, _KnownTypeChecker):
+            checker.classes = tuple(replaced.get(cls, cls)
+                                    for cls in checker.classes)
+
+
+def _redecorate(packages):
+    """Decorate only the modules changed since the last decoration.
+
+    packages ([unicode]): list of packages to decorate (including
+        subpackages).
+
+    """
+    with _phase("find_changes"):
+        changed = _changed_modules(packages)
+        replaced = {}
+        for name in changed:
+            module = sys.modules[name]
+            for cls in _forget_module(name):
+                new = module.__dict__.get(cls.__name__)
+                if isinstance(new, type) and new is not cls:
+                    replaced[cls] = new
+            _module_loaded(module)
+        _upgrade_checkers(replaced)
+    _log("Modules changed: %s.", changed, level=5)
+
+    with _phase("decorate"):
+        before = set(_decoration_map)
+        objects = []
+        for name in changed:
+            objects.extend(_module_objects(name, sys.modules[name]))
+        _decorate_packages(objects)
+        if len(_hooked_codes) > 0:
+            _install_hooks()
+        _record_modules(changed)
+
+    decorations = dict((key, internal)
+                       for key, internal in _decoration_map.items()
+                       if key not in before)
+    if len(decorations) > 0:
+        with _phase("fix_references"):
+            _fix_references(decorations)
+
+
+def _prepare_pydocs(objects, workers):
+    """Parse in parallel the pydocs of the objects to decorate.
+
+    The annotations are extracted from the pydocs (the expensive part,
+    without side effects) by a pool of processes, and then compiled
+    in this process once for each distinct annotation, so that the
+    following decoration of the objects finds everything in the caches
+    and has only to install the wrappers. Only the annotations are
+    sent back, as strings are much cheaper to transfer than trees.
+
+    objects ([(module, unicode, type|function)]): the objects to
+        decorate, as returned by _checked_objects.
+    workers (int): the number of processes to use.
+
+    """
+    docs = set()
+    for _, _, value in objects:
+        if isinstance(value, type):
+            functions = [function.__func__
+                         if isinstance(function, (staticmethod, classmethod))
+                         else function
+                         for function in value.__dict__.values()]
+        else:
+            functions = [value]
+        for function in functions:
+            if isinstance(function, types.FunctionType) and \
+                    function.__doc__ is not None:
+                docs.add(inspect.cleandoc(function.__doc__))
+    docs = [doc for doc in docs if doc not in _pydocs]
+
+    type_set = set()
+    with _phase("parse_pydocs"):
+        if len(docs) > 0:
+            chunksize = max(1, len(docs) // (4 * workers))
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                for doc, annotations in zip(
+                        docs, executor.map(_extract_annotations, docs,
+                                           chunksize=chunksize)):
+                    # Strings coming from other processes are not
+                    # interned.
+                    annotations = _interned(annotations)
+                    _pydocs[doc] = annotations
+                    type_set.update(annotations.values())
+
+    with _phase("compile_checkers"):
+        for type_ in type_set:
+            try:
+                _check(type_)
+            except ValueError:
+                # Reported when decorating.
+                pass
+
+
+def _decorate_packages(objects):
+    """Decorate with type checking all requested packages.
 
+    objects ([(module, unicode, type|function)]): the objects to
+        decorate, as returned by _checked_objects.
 
-def _fix_references():
+    """
+    for module, key, value in objects:
+        if isinstance(value, type):
+            module.__dict__[key] = _decorate_class(value)
+        else:
+            module.__dict__[key] = _decorate_function(value)
+
+
+def _fix_references(decorations):
     """Fix references to patched functions in other modules.
 
+    decorations ({int: function}): the wrapper of each patched
+        function, indexed by the id of the function.
+
     """
-    for name, module in sys.modules.iteritems():
-        if module is None:
+    for name, module in list(sys.modules.items()):
+        # Some libraries put other objects in sys.modules.
+        if not isinstance(module, types.ModuleType):
             continue
         to_add = {}
-        for key, value in module.__dict__.iteritems():
+        for key, value in list(module.__dict__.items()):
             if isinstance(value, types.FunctionType) and \
-                    id(value) in _decoration_map:
-                _log("Fixing reference to `%s' in module `%s'." %
-                     (key, module.__name__), level=5)
-                to_add[key] = _decoration_map[id(value)]
+                    id(value) in decorations:
+                _log("Fixing reference to `%s' in module `%s'.",
+                     key, module.__name__, level=5)
+                to_add[key] = decorations[id(value)]
         module.__dict__.update(to_add)
 
 
 def _install_test_types():
-    """Add to the known types all modules.
+    """Add to the known types all classes in the loaded modules.
 
     """
-    for name, module in sys.modules.iteritems():
-        if module is None:
+    _class_index.clear()
+    for name, module in list(sys.modules.items()):
+        # Some libraries put other objects in sys.modules.
+        if not isinstance(module, types.ModuleType):
             continue
-        name_parts = name.split(".")
-        for key, value in module.__dict__.iteritems():
-            if not hasattr(value, "__module__") or \
-                    value.__module__ != name:
-                continue
-            if isinstance(value, type):
-                for i in xrange(len(name_parts) + 1):
-                    complete_name = ".".join(name_parts[i:] + [key])
-                    if complete_name not in TYPES:
-                        TYPES[complete_name] = []
-                    _log("Adding type %s." % complete_name, level=5)
-                    TYPES[complete_name].append(value)
+        _index_module(name, module)
 
 
 def check_all(packages,
               none_always_valid=False,
               complain_for_missing_pydoc=False,
-              debug=0):
+              debug=0,
+              workers=None,
+              profile=False,
+              overhead_budget=None,
+              boundary_only=False,
+              trusted=None,
+              deferred=None,
+              in_place=False,
+              engine="wrapper",
+              coverage=False,
+              incremental=False):
     """Install the checker on all desired packages.
 
     To be called at the main, it adds to the known types all visible
@@ -594,13 +3590,344 @@ def check_all(packages,
         for missing pydocs, or missing type descriptions.
     debug (int): the higher, the more log lines will be printed; valid
         values are between 0 and 5.
+    workers (int|None): if more than one, the number of processes
+        used to parse the pydocs of all functions before decorating
+        them; otherwise, pydocs are parsed by this process while
+        decorating. The duration of each phase is stored in
+        STARTUP_TIMINGS.
+    profile (bool): whether, instead of checking the types, to record
+        the types actually passed to and returned by all functions
+        (also the ones without pydoc), to be compared with the pydocs
+        by propose_annotations() and profile_report().
+    overhead_budget (float|None): if not None, the maximum fraction
+        (e.g., 0.05 for 5%) of the time of the calls to each function
+        that can be spent checking them; functions whose checks are
+        more expensive are checked only on a sample of the calls, or
+        not at all, until they are called rarely. The current modes
+        are returned by tuning_modes().
+    boundary_only (bool): whether to check only the calls coming from
+        outside the checked package containing the function (one of
+        packages) and the trusted packages.
+    trusted ([unicode]|None): in boundary-only mode, packages whose
+        calls are never checked.
+    deferred (unicode|None): if "return", the return values are
+        checked by a background thread, so that the callers do not
+        wait for the checks; if "all", also the arguments. At most
+        DEFERRED_QUEUE_SIZE checks wait in the queue, the others are
+        dropped; flush_deferred() waits for the pending ones, and
+        stop_deferred() also stops the thread.
+    in_place (bool): whether to decorate the functions replacing their
+        code, instead of replacing them with a wrapper: all the
+        references to the functions are checked, without looking for
+        them in all modules.
+    engine (unicode): "wrapper" to check the calls with wrappers (or
+        trampolines); "hooks" to check them, without modifying the
+        functions, from the hooks of the interpreter (sys.monitoring
+        if available, otherwise sys.setprofile, replacing any other
+        profiler); exceptions, generators and coroutines are not
+        checked in the latter case.
+    coverage (bool): whether to record which decorated functions were
+        called, and which alternatives of the unions and keys of the
+        records in their annotations accepted some value, in a bitmap
+        returned by coverage_report().
+    incremental (bool): whether, if check_all was already called, to
+        decorate only the modules loaded or changed (for example,
+        reloaded) since, keeping the rest of the decoration; the other
+        arguments should be the same as in the previous call.
+
+    raise (ValueError): if engine or deferred are not valid, or if
+        more than one of profile, overhead_budget, boundary_only,
+        deferred, in_place and engine="hooks" is used, as each of them
+        changes how the calls are checked.
 
     """
-    global NONE_ALWAYS_VALID, COMPLAIN_FOR_MISSING_PYDOC, DEBUG
+    if engine not in ("wrapper", "hooks"):
+        raise ValueError("Invalid engine `%s'." % engine)
+    if deferred not in (None, "return", "all"):
+        raise ValueError("Invalid deferred mode `%s'." % deferred)
+    modes = [name for name, enabled in [
+        ("profile", profile),
+        ("overhead_budget", overhead_budget is not None),
+        ("boundary_only", boundary_only),
+        ("deferred", deferred is not None),
+        ("in_place", in_place),
+        ("engine=\"hooks\"", engine == "hooks")] if enabled]
+    if len(modes) > 1:
+        raise ValueError("Incompatible options: %s." % ", ".join(modes))
+
+    global NONE_ALWAYS_VALID, COMPLAIN_FOR_MISSING_PYDOC, DEBUG, PROFILE, \
+        OVERHEAD_BUDGET, BOUNDARY_ONLY, TRUSTED_PACKAGES, DEFERRED, \
+        IN_PLACE, ENGINE, COVERAGE, _coverage
     NONE_ALWAYS_VALID = none_always_valid
     COMPLAIN_FOR_MISSING_PYDOC = complain_for_missing_pydoc
     DEBUG = debug
+    PROFILE = profile
+    OVERHEAD_BUDGET = overhead_budget
+    BOUNDARY_ONLY = boundary_only
+    TRUSTED_PACKAGES = list(trusted or [])
+    DEFERRED = deferred
+    IN_PLACE = in_place
+    ENGINE = engine
+    COVERAGE = coverage
+    _checked_packages[:] = packages
+
+    STARTUP_TIMINGS.clear()
+    if incremental and len(_module_states) > 0:
+        _redecorate(packages)
+        _log("Startup timings: %s.", STARTUP_TIMINGS, level=5)
+        return
+
+    # Types and configuration may have changed since the last call.
+    _checkers.clear()
+    _own_annotation_tables.clear()
+    _annotation_tables.clear()
+    del _profiles[:]
+    del _tunings[:]
+    _caller_packages.clear()
+    _remove_hooks()
+    _pending.clear()
+    _coverage = _Coverage()
+    _module_states.clear()
+
+    with _phase("install_types"):
+        _install_test_types()
+
+    objects = _checked_objects(packages)
+    if workers is not None and workers > 1:
+        _prepare_pydocs(objects, workers)
+
+    with _phase("decorate"):
+        _decorate_packages(objects)
+        if len(_hooked_codes) > 0:
+            _install_hooks()
+        _record_modules(name for name, _ in _checked_modules(packages))
+
+    # Not needed if all functions were patched in place.
+    if len(_decoration_map) > 0:
+        with _phase("fix_references"):
+            _fix_references(_decoration_map)
+
+    _log("Startup timings: %s.", STARTUP_TIMINGS, level=5)
+
+
+def propose_annotations():
+    """Compare the types observed in profiling mode with the pydocs.
+
+    return ([{unicode: object}]): for each argument (including
+        "__return__" and "__raise__") of the profiled functions whose
+        annotation is missing or refused some of the values observed:
+        the name of the function ("function") and of the argument
+        ("argument"), the annotation in the pydoc ("documented", None
+        if missing), the annotation accepting the values observed
+        ("proposed"), the number of calls to the function ("calls")
+        and of the values refused by the documented annotation
+        ("rejected").
+
+    """
+    proposals = []
+    for profile in _profiles:
+        for name in profile.counts:
+            documented = profile.documented.get(name)
+            rejected = profile.rejected.get(name, 0)
+            if documented is not None and rejected == 0:
+                continue
+            proposals.append({
+                "function": profile.fname,
+                "argument": name,
+                "documented": documented,
+                "proposed": profile.proposal(name),
+                "calls": profile.calls,
+                "rejected": rejected,
+                })
+    return proposals
+
+
+def profile_report():
+    """Return a description of the annotations to add or fix.
+
+    return (unicode): one line for each proposal returned by
+        propose_annotations(), in the format of the pydocs.
+
+    """
+    lines = []
+    for proposal in propose_annotations():
+        name = {"__return__": "return", "__raise__": "raise"}.get(
+            proposal["argument"], proposal["argument"])
+        line = "%s: %s (%s)" % (proposal["function"], name,
+                                proposal["proposed"])
+        if proposal["documented"] is None:
+            line += "  # missing, %d calls" % proposal["calls"]
+        else:
+            line += "  # documented as (%s), %d of %d calls rejected" % (
+                proposal["documented"], proposal["rejected"],
+                proposal["calls"])
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def tuning_modes():
+    """Return how the functions decorated with a budget are checked.
+
+    return ({unicode: unicode}): the mode ("on", "sampled" or "off") of
+        each function, indexed by its name.
+
+    """
+    return dict((tuning.fname, tuning.mode) for tuning in _tunings)
+
+
+def coverage_report():
+    """Return what was exercised since check_all(coverage=True).
+
+    return ([{unicode: object}]): for each bit of the coverage bitmap,
+        in the order they were allocated: its index ("bit"), the name
+        of the function ("function"); for the branches of the
+        annotations, the argument ("argument", "__return__" or
+        "__yield__"), its annotation ("annotation") and the branch
+        ("fragment", an alternative of a union, or "<key>: <type>" for
+        a key of a record), all None for the bit of the function
+        itself; and whether it was hit ("hit").
+
+    """
+    return [{"bit": index,
+             "function": fname,
+             "argument": argument,
+             "annotation": annotation,
+             "fragment": fragment,
+             "hit": _coverage.is_set(index)}
+            for index, (fname, argument, annotation, fragment)
+            in enumerate(_coverage.labels)]
+
+
+def _deep_size(obj, seen):
+    """Return the memory used by obj and by the data it contains.
+
+    Containers and the objects created by the decoration (checkers and
+    binding plans) are visited; other objects (functions, classes,
+    modules) belong to the checked program and are not counted.
+
+    obj (object): the object to measure.
+    seen ({int: object}): the objects already counted, by id, updated;
+        they are kept alive, so that their ids are not reused by new
+        objects while measuring.
+
+    return (int): the size in bytes of the objects not in seen.
+
+    """
+    size = 0
+    stack = [obj]
+    while len(stack) > 0:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen[id(obj)] = obj
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, (_Checker, _BindingPlan)):
+            stack.extend(getattr(obj, name)
+                         for cls in type(obj).__mro__
+                         for name in cls.__dict__.get("__slots__", ())
+                         if hasattr(obj, name))
+        elif not isinstance(obj, (str, bytes, int, float)):
+            continue
+        size += sys.getsizeof(obj)
+    return size
+
+
+def memory_report():
+    """Return the memory used by the decoration of the last check_all.
+
+    Objects shared between the parts (like interned strings) are
+    counted only in the first part using them, so that the total is
+    not inflated.
+
+    return ({unicode: int}): the number of wrappers installed
+        ("wrappers") and of distinct compiled checkers ("checkers"),
+        and the size in bytes of the wrappers with their closures and
+        binding plans ("wrapper_bytes"), of the checkers
+        ("checker_bytes"), of the caches of the annotations
+        ("annotation_bytes"), of the index of the known types
+        ("type_bytes"), and their sum ("total_bytes").
+
+    """
+    seen = {}
+    checker_bytes = _deep_size(_checkers, seen)
+    wrapper_bytes = _deep_size(_decoration_map, seen)
+    for wrapper in _decoration_map.values():
+        wrapper_bytes += sys.getsizeof(wrapper) + \
+            _deep_size(wrapper.__dict__, seen)
+        for cell in wrapper.__closure__ or ():
+            wrapper_bytes += sys.getsizeof(cell)
+            if isinstance(cell.cell_contents, _BindingPlan):
+                wrapper_bytes += _deep_size(cell.cell_contents, seen)
+    report = {
+        "wrappers": len(_decoration_map),
+        # The same checker is cached by its annotation and by the
+        # structure of its tree.
+        "checkers": len(set(id(checker) for checker in _checkers.values())),
+        "wrapper_bytes": wrapper_bytes,
+        "checker_bytes": checker_bytes,
+        "annotation_bytes": _deep_size([_pydocs, _own_annotation_tables,
+                                        _annotation_tables], seen),
+        "type_bytes": _deep_size([TYPES, PREDICATES, _class_index], seen),
+        }
+    report["total_bytes"] = sum(value for key, value in report.items()
+                                if key.endswith("_bytes"))
+    return report
+
+
+def process_stats():
+    """Return the statistics of the checks done by this process.
+
+    return ({unicode: int}): the pid of the process, the number of
+        violations reported by it (since it was forked, if it was
+        forked after the decoration), and of the deferred checks it
+        dropped.
+
+    """
+    return {"pid": _stats.pid, "violations": _stats.violations,
+            "dropped": _stats.dropped}
+
+
+def prepare_fork():
+    """Prepare the decorated process to be forked into workers.
+
+    To be called in the master process of a pre-fork server, after
+    check_all() and right before forking, so that workers inherit the
+    decorated functions instead of calling check_all() again. The
+    caches needed only during the decoration are dropped, and all the
+    objects created so far are moved out of the reach of the garbage
+    collector (where supported), so that collections in the workers do
+    not write on, and hence copy, the pages shared with the master.
+
+    """
+    _pydocs.clear()
+    _own_annotation_tables.clear()
+    _annotation_tables.clear()
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+def after_fork():
+    """Reset the per-process state in a freshly forked worker.
+
+    This is called automatically after os.fork() where supported; it
+    is exposed for servers creating workers in other ways. Only the
+    statistics, the registry of the warnings already issued (so that
+    the first occurrence of each violation is reported also by the
+    worker) and the queue of the deferred checks (whose thread is not
+    inherited) are reset: the decoration is inherited.
+
+    """
+    global _stats, _deferred
+    _stats = _ProcessStats()
+    _deferred = None
+    globals().pop("__warningregistry__", None)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=after_fork)
 
-    _install_test_types()
-    _decorate_packages(packages)
-    _fix_references()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A pytest plugin checking the pydocs while running the tests.
+
+The packages given with --pydocchecker (or the pydocchecker_packages
+ini option) are decorated once per session, after the collection (so
+that the references imported by the test modules are fixed too); with
+parallel workers (pytest-xdist), once in each worker. Each violation
+is attributed to the test (and phase: setup, call or teardown) running
+when it is found, and listed in a section of its report, which travels
+to the controller together with the report; with --pydocchecker-fail,
+tests with violations fail.
+
+"""
+
+import importlib
+import time
+
+import pytest
+
+import pydocchecker
+
+
+def pytest_addoption(parser):
+    """Add the options of the plugin.
+
+    parser (Parser): the parser of the options of pytest.
+
+    """
+    group = parser.getgroup("pydocchecker")
+    group.addoption("--pydocchecker", action="append", default=[],
+                    metavar="PACKAGE", dest="pydocchecker_packages",
+                    help="check the pydocs of the functions in PACKAGE "
+                    "(and its subpackages); can be repeated.")
+    group.addoption("--pydocchecker-fail", action="store_true",
+                    default=False, dest="pydocchecker_fail",
+                    help="fail the tests whose execution violated some "
+                    "pydoc, instead of just reporting them.")
+    parser.addini("pydocchecker_packages", type="linelist", default=[],
+                  help="packages whose pydocs are checked.")
+
+
+def pytest_configure(config):
+    """Register the plugin, if some package is to be checked.
+
+    config (Config): the configuration of pytest.
+
+    """
+    packages = config.getoption("pydocchecker_packages") + \
+        config.getini("pydocchecker_packages")
+    if len(packages) > 0:
+        config.pluginmanager.register(
+            PydocCheckerPlugin(packages,
+                               config.getoption("pydocchecker_fail")),
+            "pydocchecker-session")
+
+
+class PydocCheckerPlugin(object):
+    """The state of the checks during a session of pytest.
+
+    packages ([unicode]): the packages to check.
+    fail (bool): whether to fail the tests with violations.
+    violations ([unicode]): the violations found since the last
+        report was made.
+    reported ({unicode: int}): the number of violations of each test
+        with some, by test id.
+    startup (float|None): the duration in seconds of the decoration,
+        if done by this process.
+
+    """
+
+    def __init__(self, packages, fail):
+        self.packages = packages
+        self.fail = fail
+        self.violations = []
+        self.reported = {}
+        self.startup = None
+
+    def sink(self, event):
+        """Record the violations, see pydocchecker.add_trace_sink.
+
+        event ({unicode: object}): the trace event.
+
+        """
+        if event["event"] == "violation":
+            self.violations.append(event["message"])
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_finish(self, session):
+        """Decorate the packages, once the tests are collected.
+
+        session (Session): the session of pytest.
+
+        """
+        start = time.perf_counter()
+        for package in self.packages:
+            importlib.import_module(package)
+        pydocchecker.check_all(self.packages)
+        self.startup = time.perf_counter() - start
+        pydocchecker.add_trace_sink(self.sink)
+
+    def pytest_unconfigure(self, config):
+        """Stop recording the violations.
+
+        config (Config): the configuration of pytest.
+
+        """
+        if self.startup is not None:
+            pydocchecker.remove_trace_sink(self.sink)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """Attach the violations of a phase of a test to its report.
+
+        item (Item): the test.
+        call (CallInfo): the outcome of the phase.
+
+        """
+        if pydocchecker.DEFERRED is not None:
+            pydocchecker.flush_deferred()
+        violations, self.violations = self.violations, []
+        outcome = yield
+        if len(violations) == 0:
+            return
+        report = outcome.get_result()
+        report.user_properties.append(
+            ("pydocchecker_violations", len(violations)))
+        text = "\n\n".join(violations)
+        report.sections.append(
+            ("pydocchecker violations (%s)" % report.when, text))
+        if self.fail and report.passed:
+            report.outcome = "failed"
+            report.longrepr = "%d pydoc violations, see the section " \
+                "below." % len(violations)
+
+    def pytest_runtest_logreport(self, report):
+        """Count the violations of each test, also from the workers.
+
+        report (TestReport): the report of a phase of a test.
+
+        """
+        for name, value in report.user_properties:
+            if name == "pydocchecker_violations":
+                self.reported[report.nodeid] = \
+                    self.reported.get(report.nodeid, 0) + value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """List the tests with violations.
+
+        terminalreporter (TerminalReporter): the reporter of pytest.
+
+        """
+        terminalreporter.section("pydocchecker")
+        if self.startup is not None:
+            terminalreporter.write_line(
+                "Decorated %s in %.3fs." % (", ".join(self.packages),
+                                           self.startup))
+        for nodeid, count in sorted(self.reported.items()):
+            terminalreporter.write_line(
+                "%s: %d violations" % (nodeid, count))
+        terminalreporter.write_line(
+            "%d violations in %d tests." % (sum(self.reported.values()),
+                                           len(self.reported)))
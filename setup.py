@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
 # Pydoc Checker
@@ -31,7 +31,11 @@ setup(name="pydocchecker",
       "archive/master.tar.gz",
       description="A Python module validating the arguments "
       "of methods and functions.",
-      py_modules=["pydocchecker"],
+      py_modules=["pydocchecker", "pytest_pydocchecker"],
+      entry_points={
+          "pytest11": ["pytest_pydocchecker = pytest_pydocchecker"],
+          },
+      python_requires=">=3.8",
       namespace_packages=[],
       keywords="python type checking validation",
       license="GNU General Public License v3 (GPLv3)",
@@ -42,6 +46,7 @@ setup(name="pydocchecker",
           "Intended Audience :: Developers",
           "Operating System :: OS Independent",
           "Programming Language :: Python",
+          "Programming Language :: Python :: 3",
           "Topic :: Software Development :: Quality Assurance",
           "License :: OSI Approved :: "
           "GNU General Public License v3 (GPLv3)",
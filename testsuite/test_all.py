@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
 # Pydoc Checker
@@ -20,6 +20,7 @@
 """Complete tests for Pydoc Checker."""
 
 import os
+import subprocess
 import sys
 import unittest
 
@@ -45,14 +46,79 @@ class PydocCheckerTests(unittest.TestCase):
     def test_importing(self):
         self._test("test_importing.py")
 
+    def test_exceptions(self):
+        self._test("test_exceptions.py")
+
+    def test_inheritance(self):
+        self._test("test_inheritance.py")
+
+    def test_arguments(self):
+        self._test("test_arguments.py")
+
+    def test_syntax(self):
+        self._test("test_syntax.py")
+
+    def test_parallel(self):
+        self._test("test_parallel.py")
+
+    def test_fork(self):
+        self._test("test_fork.py")
+
+    def test_memory(self):
+        self._test("test_memory.py")
+
+    def test_profile(self):
+        self._test("test_profile.py")
+
+    def test_tuning(self):
+        self._test("test_tuning.py")
+
+    def test_async(self):
+        self._test("test_async.py")
+
+    def test_boundary(self):
+        self._test("test_boundary.py")
+
+    def test_register(self):
+        self._test("test_register.py")
+
+    def test_deferred(self):
+        self._test("test_deferred.py")
+
+    def test_descriptors(self):
+        self._test("test_descriptors.py")
+
+    def test_in_place(self):
+        self._test("test_in_place.py")
+
+    def test_hooks(self):
+        self._test("test_hooks.py")
+
+    def test_pending(self):
+        self._test("test_pending.py")
+
+    def test_trace(self):
+        self._test("test_trace.py")
+
+    def test_coverage(self):
+        self._test("test_coverage.py")
+
+    def test_pytest(self):
+        self._test("test_pytest.py")
+
+    def test_incremental(self):
+        self._test("test_incremental.py")
+
     def _test(self, filename):
-        assert 0 == os.system(os.path.join(".", "testsuite", filename))
+        assert 0 == subprocess.call(
+            [sys.executable, os.path.join(".", "testsuite", filename)])
 
 
 def suite():
     """Create the testsuite comprising all the tests."""
     ret = unittest.TestSuite()
-    ret.addTest(unittest.makeSuite(PydocCheckerTests))
+    ret.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(PydocCheckerTests))
     return ret
 
 
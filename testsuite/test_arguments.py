@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the binding of the arguments to their types."""
+
+import sys
+
+import testsuite.testh.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testh.modulea
+
+    # No warnings here.
+    module.foo(1, c="c")
+    module.foo(1, 2, 3, 4, c="c", d=5, e="e", f="f")
+    module.foo(a=1, b=2, c="c")
+    module.bar()
+    module.bar(1, 2, e="e")
+    assert_warnings(0)
+
+    # Wrong positional arguments, passed by position or by name.
+    module.foo("1", c="c")
+    assert_warnings(1)
+    module.foo(a="1", b="2", c="c")
+    assert_warnings(2)
+
+    # Wrong *args.
+    module.foo(1, 2, "3", 4, "5", c="c")
+    assert_warnings(2)
+    module.bar(1, "2")
+    assert_warnings(1)
+
+    # Wrong keyword-only arguments.
+    module.foo(1, c=1, d="d")
+    assert_warnings(2)
+
+    # Wrong **kwargs.
+    module.foo(1, c="c", e=1)
+    assert_warnings(1)
+    module.bar(e="e", f=1)
+    assert_warnings(1)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite"], debug=5)
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the decoration of coroutines and asynchronous generators."""
+
+import asyncio
+import inspect
+import sys
+
+import testsuite.testm.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+async def run():
+    module = testsuite.testm.modulea
+
+    # The result of the coroutine is checked, not the coroutine.
+    assert await module.foo(1) == 1
+    assert_warnings(0)
+    assert await module.foo(0) is None
+    assert_warnings(1)
+    # The arguments are checked on call, before the coroutine runs.
+    coroutine = module.foo(None)
+    assert_warnings(1)
+    try:
+        await coroutine
+    except TypeError:
+        pass
+    assert_warnings(1)
+    try:
+        await module.foo(-1)
+    except KeyError:
+        pass
+    assert_warnings(0)
+
+    # Values yielded are checked, and sent values forwarded.
+    assert [item async for item in module.bar(2)] == [0, "1"]
+    assert_warnings(1)
+    generator = module.bar(10)
+    assert await generator.asend(None) == 0
+    assert await generator.asend(3) == 1
+    assert_warnings(0)
+    assert await generator.asend(None) == "2"
+    assert_warnings(1)
+    await generator.aclose()
+
+
+def main():
+    module = testsuite.testm.modulea
+    assert asyncio.iscoroutinefunction(module.foo), \
+        "Coroutine function not recognized after decoration."
+    # Before Python 3.12, inspect recognizes only "async def".
+    if hasattr(inspect, "markcoroutinefunction"):
+        assert inspect.iscoroutinefunction(module.foo), \
+            "Coroutine function not recognized after decoration."
+    assert inspect.isasyncgenfunction(module.bar), \
+        "Asynchronous generator not recognized after decoration."
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testm"], debug=5)
+    sys.exit(main())
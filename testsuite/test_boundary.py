@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the checking of the calls at package boundaries only."""
+
+import sys
+import types
+
+import testsuite.testn.modulea
+import testsuite.testn.moduleb
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testn.modulea
+
+    # Calls from outside the package are checked.
+    module.inner("a")
+    assert_warnings(1)
+    module.outer(1)
+    assert_warnings(1)
+
+    # Calls from inside are not.
+    module.outer("a")
+    assert_warnings(0)
+
+    # Neither calls from trusted packages.
+    testsuite.testn.moduleb.trusted_caller()
+    assert_warnings(0)
+
+    # Identical callers in different modules have equal code objects,
+    # but they are not confused.
+    callers = []
+    for name in ["testsuite.testn.modulea", "testsuite.outside"]:
+        caller = types.ModuleType(name)
+        caller.inner = module.inner
+        exec(compile("def call(a):\n    inner(a)\n",
+                     name.replace(".", "/") + ".py", "exec"),
+             caller.__dict__)
+        callers.append(caller.call)
+    assert callers[0].__code__ == callers[1].__code__
+    callers[0]("a")
+    assert_warnings(0)
+    callers[1]("a")
+    assert_warnings(1)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testn.modulea"], debug=5,
+                           boundary_only=True,
+                           trusted=["testsuite.testn.moduleb"])
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the coverage map of the annotations."""
+
+import sys
+
+import testsuite.testu.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def hits():
+    """Return the labels of the bits hit so far.
+
+    return ({(unicode, unicode|None, unicode|None): bool}): whether
+        each function, argument and fragment was hit.
+
+    """
+    return dict(((entry["function"], entry["argument"], entry["fragment"]),
+                 entry["hit"])
+                for entry in pydocchecker.coverage_report())
+
+
+def main():
+    module = testsuite.testu.modulea
+    report = hits()
+    assert not any(report.values()), "Bits set before any call."
+    assert ("undocumented", None, None) not in report, \
+        "Bit allocated for an undecorated function."
+
+    module.lookup(1)
+    module.lookup("a", 2)
+    module.configure({"name": "a", "size": 1})
+    # Violations do not hit the branches.
+    module.configure({"name": 1, "size": 1})
+    assert_warnings(1)
+
+    report = hits()
+    assert report == {
+        ("lookup", "key", "int"): True,
+        ("lookup", "key", "unicode"): True,
+        ("lookup", "default", "int"): True,
+        ("lookup", "default", "None"): False,
+        ("lookup", "__return__", "int"): True,
+        ("lookup", "__return__", "float"): False,
+        ("lookup", None, None): True,
+        ("configure", "options", "'name': unicode"): True,
+        ("configure", "options", "'size'?: int"): True,
+        ("configure", None, None): True,
+        ("unused", None, None): False,
+        }, report
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testu"], debug=5, coverage=True)
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the checks deferred to a background thread."""
+
+import sys
+import threading
+
+import testsuite.testp.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+MESSAGES = []
+
+
+def main():
+    foo = testsuite.testp.modulea.foo
+
+    foo(1)
+    pydocchecker.flush_deferred()
+    assert_warnings(0)
+
+    # One violation for the argument, one for the return value, both
+    # reported by the background thread with the call site.
+    foo("a")
+    pydocchecker.flush_deferred()
+    assert_warnings(2)
+    assert all("line" in message and "`main'" in message
+               for message in MESSAGES), "Missing call site."
+
+    # When the queue is full, checks are dropped.
+    pydocchecker.DEFERRED_QUEUE_SIZE = 1
+    pydocchecker.stop_deferred()
+    before = pydocchecker.process_stats()
+    for _ in range(1000):
+        foo("a")
+    pydocchecker.flush_deferred()
+    stats = pydocchecker.process_stats()
+    violations = stats["violations"] - before["violations"]
+    dropped = stats["dropped"] - before["dropped"]
+    assert dropped > 0, "No check dropped."
+    assert_warnings(violations)
+    assert violations + dropped == 2000, "Some check went missing."
+
+    # Modes that would override each other are refused.
+    for options in [{"boundary_only": True}, {"in_place": True},
+                    {"engine": "hooks"}, {"profile": True}]:
+        try:
+            pydocchecker.check_all(["testsuite.testp"], debug=5,
+                                   deferred="all", **options)
+        except ValueError:
+            pass
+        else:
+            assert False, "Incompatible options accepted: %s." % options
+    foo(1)
+    pydocchecker.stop_deferred()
+    assert_warnings(0)
+    assert all(thread.name != "pydocchecker"
+               for thread in threading.enumerate()), "Thread not stopped."
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testp"], debug=5, deferred="all")
+    warn = pydocchecker.warn
+
+    def recording_warn(message):
+        MESSAGES.append(message)
+        warn(message)
+    pydocchecker.warn = recording_warn
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the decoration of static methods, class methods and
+properties."""
+
+import sys
+
+from testsuite.testq.modulea import ClassA
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    # The descriptors are kept, around a single wrapper.
+    for name, descriptor in (("static", staticmethod),
+                             ("create", classmethod),
+                             ("value", property)):
+        assert type(ClassA.__dict__[name]) is descriptor, \
+            "Descriptor `%s' not kept." % name
+    static = ClassA.__dict__["static"].__func__
+    assert static.__pydc_patched__ and \
+        not hasattr(static.__wrapped__, "__wrapped__"), \
+        "Static method not wrapped once."
+
+    instance = ClassA()
+    assert instance.static(1) == 1 and ClassA.static(1) == 1
+    assert_warnings(0)
+    instance.static("a")
+    assert_warnings(2)
+
+    assert isinstance(ClassA.create(1), ClassA)
+    assert isinstance(instance.create(1), ClassA)
+    assert_warnings(0)
+    ClassA.create("a")
+    assert_warnings(1)
+
+    # Setters check their argument, getters their return value.
+    instance.value = 1
+    assert instance.value == 1
+    assert_warnings(0)
+    instance.value = "a"
+    assert_warnings(1)
+    assert instance.value == "a"
+    assert_warnings(1)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testq"], debug=5)
+    sys.exit(main())
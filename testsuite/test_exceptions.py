@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the checking of the exceptions raised."""
+
+from __future__ import absolute_import
+
+import sys
+
+import testsuite.testf.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def call(function, error):
+    """Call function, making sure that it raises error."""
+    try:
+        function(error)
+    except Exception as raised:
+        assert raised is error, "The exception was not propagated."
+    else:
+        assert False, "The exception was not propagated."
+
+
+def main():
+    module = testsuite.testf.modulea
+
+    # No warnings here, the exceptions are described.
+    call(module.raise_expected, KeyError())
+    call(module.raise_expected, ValueError())
+    call(module.raise_expected, module.CustomError())
+    assert_warnings(0)
+
+    # Unexpected exception.
+    call(module.raise_expected, TypeError())
+    assert_warnings(1)
+
+    # No exception described, but other types are.
+    call(module.raise_undocumented, KeyError())
+    assert_warnings(1)
+
+    # No type annotations at all, exceptions are not checked.
+    call(module.raise_without_types, KeyError())
+    assert_warnings(0)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite"], debug=5)
+    sys.exit(main())
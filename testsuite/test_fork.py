@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the inheritance of the decoration by forked workers."""
+
+import os
+import sys
+
+import testsuite.testa.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def worker():
+    """Run in the forked worker, return its exit code."""
+    module = testsuite.testa.modulea
+    assert pydocchecker.process_stats() == {"pid": os.getpid(),
+                                            "violations": 0,
+                                            "dropped": 0}, \
+        "Statistics were not reset."
+
+    # The decoration is inherited.
+    module.foo(module.ClassA(), 0)
+    assert_warnings(0)
+    module.foo(None, 0)
+    assert_warnings(2)
+    assert pydocchecker.process_stats()["violations"] == 2
+
+    return 0
+
+
+def main():
+    module = testsuite.testa.modulea
+    module.foo(None, 0)
+    assert_warnings(2)
+    assert pydocchecker.process_stats()["violations"] == 2
+
+    pydocchecker.prepare_fork()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            code = worker()
+        except BaseException:
+            code = 1
+        os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0, \
+        "The worker failed."
+
+    # The parent is not affected.
+    assert pydocchecker.process_stats()["violations"] == 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testa"], debug=5)
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the checking engine based on interpreter hooks."""
+
+import cProfile
+import pstats
+import sys
+
+import testsuite.tests.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.tests.modulea
+    # The invalid default value.
+    assert_warnings(1)
+
+    # Functions are not replaced.
+    assert "__pydc_patched__" not in module.foo.__dict__
+    assert "__wrapped__" not in module.foo.__dict__
+
+    module.foo(1)
+    module.foo(1, 2, 3, d=4)
+    assert_warnings(0)
+    module.foo("a", 2, "b", d="c")
+    assert_warnings(3 + 1)
+    module.foo(1, 0)
+    assert_warnings(1)
+
+    # A function raising does not return None.
+    try:
+        module.bar(1)
+    except KeyError:
+        pass
+    assert_warnings(0)
+
+    module.ClassA().method("a")
+    assert_warnings(1)
+
+    # With sys.monitoring, profilers can run together with the checks.
+    if hasattr(sys, "monitoring"):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            module.foo("a")
+        finally:
+            profiler.disable()
+        assert_warnings(2)
+        assert any(name == "foo" for _, _, name in
+                   pstats.Stats(profiler).stats), "foo was not profiled."
+
+    # Hooks are removed by the next call.
+    pydocchecker.check_all([], debug=5)
+    module.foo("a")
+    assert_warnings(0)
+
+    # The tool identifier of another profiler is left alone.
+    if hasattr(sys, "monitoring"):
+        monitoring = sys.monitoring
+        monitoring.use_tool_id(monitoring.PROFILER_ID, "other")
+        try:
+            pydocchecker.check_all(["testsuite.tests"], debug=5,
+                                   engine="hooks")
+            assert_warnings(1)
+            module.foo("a")
+            assert_warnings(2)
+            pydocchecker.check_all([], debug=5)
+            assert monitoring.get_tool(monitoring.PROFILER_ID) == "other"
+        finally:
+            monitoring.free_tool_id(monitoring.PROFILER_ID)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.tests"], debug=5, engine="hooks")
+    sys.exit(main())
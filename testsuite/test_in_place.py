@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the decoration of functions in place."""
+
+import inspect
+import sys
+
+import testsuite.testr.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testr.modulea
+    foo = module.CALLBACKS["foo"]
+    bar = module.CALLBACKS["bar"][0]
+
+    # The functions are the same objects, with the same signature.
+    assert foo is module.foo and bar is module.bar
+    assert "fix_references" not in pydocchecker.STARTUP_TIMINGS, \
+        "References were looked for."
+    assert str(inspect.signature(foo)) == "(a, b=1, *args, c=2, **kwargs)"
+    assert foo.__code__.co_name == "foo"
+
+    # Also references never fixed are checked.
+    assert foo(1) == 4 and foo(1, 2, c=3) == 6
+    assert_warnings(0)
+    foo(1, 2.5)
+    assert_warnings(2)
+    try:
+        foo(-1)
+    except KeyError:
+        pass
+    assert_warnings(0)
+    foo(1.5, c=1)
+    assert_warnings(2)
+
+    # Closures still work.
+    assert bar(1) == 2
+    assert_warnings(0)
+    bar(1.5)
+    assert_warnings(2)
+
+    module.ClassA().method("a")
+    assert_warnings(1)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testr"], debug=5, in_place=True)
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the incremental decoration after reloading modules."""
+
+import importlib
+import sys
+
+import testsuite.testw.modulea
+import testsuite.testw.moduleb
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    modulea = testsuite.testw.modulea
+    moduleb = testsuite.testw.moduleb
+    old_foo = modulea.foo
+    old_bar = moduleb.bar
+    old_instance = modulea.ClassA()
+    wrappers = len(pydocchecker._decoration_map)
+    modulea.foo("a")
+    assert_warnings(1)
+    moduleb.bar(old_instance)
+    assert_warnings(0)
+
+    patched = []
+
+    def sink(event):
+        if event["event"] == "log" and \
+                event["message"].startswith("Patching function"):
+            patched.append(event["message"])
+
+    pydocchecker.add_trace_sink(sink)
+    importlib.reload(modulea)
+    pydocchecker.check_all(["testsuite.testw"], debug=5, incremental=True)
+    assert sorted(patched) == ["Patching function `ClassA.method'.",
+                               "Patching function `foo'."], patched
+    assert "find_changes" in pydocchecker.STARTUP_TIMINGS
+    assert len(pydocchecker._decoration_map) == wrappers, \
+        "Stale decorations not discarded."
+
+    # The reloaded module is checked, the other is kept.
+    assert modulea.foo is not old_foo
+    assert moduleb.bar is old_bar
+    modulea.foo("a")
+    assert_warnings(1)
+    modulea.ClassA().method("a")
+    assert_warnings(1)
+
+    # The annotations refer to the reloaded classes.
+    moduleb.bar(modulea.ClassA())
+    assert_warnings(0)
+    moduleb.bar(old_instance)
+    assert_warnings(1)
+
+    # Nothing changed, nothing to decorate.
+    del patched[:]
+    pydocchecker.check_all(["testsuite.testw"], debug=5, incremental=True)
+    assert patched == [], patched
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testw"], debug=5)
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the fallback on the pydoc of the ancestors."""
+
+from __future__ import absolute_import
+
+import sys
+
+import testsuite.testg.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testg.modulea
+    base = module.Base()
+    child_without = module.ChildWithoutPydoc()
+    child_partial = module.ChildWithPartialPydoc()
+    grand_child = module.GrandChild()
+
+    # No warnings here.
+    base.foo(1, "a")
+    child_without.foo(1, "a")
+    child_partial.foo(1, "a")
+    assert_warnings(0)
+
+    # The pydoc of Base is used for the child without pydoc.
+    child_without.foo(1, 1)
+    assert_warnings(1)
+
+    # Wrong first parameter and return value.
+    child_without.foo(None, "a")
+    assert_warnings(2)
+
+    # a comes from the child, b and the return value from Base.
+    child_partial.foo(1, 1)
+    assert_warnings(1)
+    child_partial.foo(None, "a")
+    assert_warnings(1)
+    child_partial.foo("1", "a")
+    assert_warnings(2)
+
+    # Pydoc found two levels up; the return value is wrong.
+    grand_child.foo(1, "a")
+    assert_warnings(1)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite"], debug=5)
+    sys.exit(main())
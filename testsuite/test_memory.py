@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the compact representation of the decoration."""
+
+import sys
+
+import testsuite.testj.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testj.modulea
+
+    # Classes are found with any suffix of their complete name.
+    module.foo(module.ClassA())
+    assert_warnings(0)
+    module.foo(1)
+    assert_warnings(1)
+
+    # Functions without annotations are not wrapped.
+    assert "__pydc_patched__" not in module.bar.__dict__, \
+        "A function without annotations was wrapped."
+
+    report = pydocchecker.memory_report()
+    assert report["wrappers"] == 1, "Wrong number of wrappers."
+    assert report["checkers"] == 1, "Wrong number of checkers."
+    parts = [value for key, value in report.items()
+             if key.endswith("_bytes") and key != "total_bytes"]
+    assert report["total_bytes"] == sum(parts), "Wrong total."
+    assert all(value > 0 for value in report.values()), \
+        "Missing part in the report."
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testj"], debug=5)
+    sys.exit(main())
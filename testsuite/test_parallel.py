@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the decoration with pydocs parsed in parallel."""
+
+import sys
+
+from testsuite.test_all import pydocchecker
+from testsuite.test_success import main as main_success
+from testsuite.test_types import main as main_types
+
+
+def main():
+    assert "parse_pydocs" in pydocchecker.STARTUP_TIMINGS, \
+        "Pydocs were not parsed in parallel."
+
+    # Same behavior as the serial decoration.
+    main_success()
+    main_types()
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite"], debug=5, workers=2)
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the resolution of types imported after the decoration."""
+
+import importlib
+import os
+import sys
+import tempfile
+import zipfile
+
+import testsuite.testt.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testt.modulea
+
+    # Not imported yet: anything is accepted.
+    module.foo(1)
+    module.bar({"a": [1]})
+    assert_warnings(0)
+
+    # Loaders shared by many modules (one for each zip file) are not
+    # modified when watching the imports.
+    directory = tempfile.mkdtemp()
+    archive = os.path.join(directory, "zipped.zip")
+    with zipfile.ZipFile(archive, "w") as zipped:
+        zipped.writestr("zipped/__init__.py", "")
+        for i in range(5):
+            zipped.writestr("zipped/module%d.py" % i, "x = %d\n" % i)
+    sys.path.insert(0, archive)
+    try:
+        for i in range(5):
+            zipped_module = importlib.import_module("zipped.module%d" % i)
+            loader = zipped_module.__loader__
+            assert zipped_module.__spec__.loader is loader
+            assert "exec_module" not in getattr(loader, "__dict__", {}), \
+                "A shared loader was modified."
+    finally:
+        sys.path.remove(archive)
+        os.remove(archive)
+        os.rmdir(directory)
+
+    moduleb = importlib.import_module("testsuite.testt.moduleb")
+    module.foo(moduleb.ClassB())
+    module.bar({"a": [moduleb.ClassB()]})
+    assert_warnings(0)
+    assert moduleb.__loader__ is moduleb.__spec__.loader
+    module.foo(1)
+    assert_warnings(1)
+    module.bar({"a": [1]})
+    assert_warnings(1)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testt"], debug=5)
+    sys.exit(main())
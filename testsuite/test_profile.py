@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the profiling mode."""
+
+import sys
+
+import testsuite.testk.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testk.modulea
+
+    # Nothing is checked.
+    module.foo(1, [1, 2, None], 1.0, c={"x": (1, "y")})
+    module.foo("a", [])
+    try:
+        module.foo(1, None)
+    except KeyError:
+        pass
+    for i in range(pydocchecker.PROFILE_MAX_TYPES + 1):
+        module.bar((None,) * i)
+    assert_warnings(0)
+
+    proposals = dict(((proposal["function"], proposal["argument"]),
+                      proposal)
+                     for proposal in pydocchecker.propose_annotations())
+    expected = {
+        ("foo", "a"): "int|str",
+        ("foo", "b"): "[None|int]|[]|None",
+        ("foo", "args"): "[float]",
+        ("foo", "kwargs"): "{str: {str: (int, str)}}",
+        ("foo", "__return__"): "int|str",
+        ("foo", "__raise__"): "KeyError",
+        ("bar", "a"): "object",
+        ("bar", "__return__"): "object",
+        }
+    assert sorted(proposals) == sorted(expected), \
+        "Wrong arguments proposed: %s." % sorted(proposals)
+    for key, proposed in expected.items():
+        assert proposals[key]["proposed"] == proposed, \
+            "Wrong proposal for %s: %s." % (key, proposals[key]["proposed"])
+    assert proposals[("foo", "a")]["documented"] == "int" and \
+        proposals[("foo", "a")]["rejected"] == 1 and \
+        proposals[("foo", "a")]["calls"] == 3, \
+        "Wrong comparison with the pydoc."
+
+    assert "foo: a (int|str)  # documented as (int), 1 of 3 calls rejected" \
+        in pydocchecker.profile_report().split("\n"), "Wrong report."
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testk"], debug=5, profile=True)
+    sys.exit(main())
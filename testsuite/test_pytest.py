@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the pytest plugin."""
+
+import os
+import sys
+
+import pytest
+
+from testsuite.test_all import pydocchecker
+
+
+class Reports(object):
+    """Plugin collecting the reports of the calls of the tests."""
+
+    def __init__(self):
+        self.reports = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            self.reports[report.nodeid.rpartition("::")[2]] = report
+
+
+def main():
+    collector = Reports()
+    ret = pytest.main(["-q", "-p", "pytest_pydocchecker",
+                       "-p", "no:cacheprovider",
+                       "--pydocchecker", "testsuite.testv",
+                       "--pydocchecker-fail",
+                       os.path.join("testsuite", "testv", "checks.py")],
+                      plugins=[collector])
+    assert ret == pytest.ExitCode.TESTS_FAILED, ret
+
+    reports = collector.reports
+    assert reports["test_good"].passed, "Test without violations failed."
+    assert reports["test_good"].user_properties == []
+    for name, violations in [("test_bad", 2), ("test_twice_bad", 4)]:
+        assert reports[name].failed, "Test with violations passed."
+        assert reports[name].user_properties == [
+            ("pydocchecker_violations", violations)], \
+            reports[name].user_properties
+        assert any(title.startswith("pydocchecker")
+                   for title, _ in reports[name].sections), \
+            "Violations not reported."
+
+    assert pydocchecker.process_stats()["violations"] == 6
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the registration of custom type names."""
+
+import sys
+
+import testsuite.testo.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    foo = testsuite.testo.modulea.foo
+
+    foo(1, 2, len)
+    foo(1.5, 0, lambda: None)
+    assert_warnings(0)
+
+    foo("1", 2, len)
+    assert_warnings(1)
+    foo(1, 3, len)
+    assert_warnings(1)
+    foo(1, None, None)
+    assert_warnings(2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.register_type("number", int, float)
+    pydocchecker.register_predicate(
+        "even", lambda obj: isinstance(obj, int) and obj % 2 == 0)
+    pydocchecker.check_all(["testsuite.testo"], debug=5)
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the parsing of invalid type annotations."""
+
+import sys
+
+import testsuite.testi.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    # Invalid annotations are reported once, when patching the module.
+    assert_warnings(7)
+
+    # And then ignored.
+    testsuite.testi.modulea.foo(None, 1)
+    assert_warnings(0)
+
+    # Valid annotations are still checked.
+    testsuite.testi.modulea.foo(None, None)
+    assert_warnings(1)
+
+    testsuite.testi.modulea.bar([[[[{1: (1, ["a", None])}]]]])
+    assert_warnings(0)
+    testsuite.testi.modulea.bar([[[[{1: (1, [1])}]]]])
+    assert_warnings(1)
+
+    # Deep nesting is fine, and equivalent subtrees share the checker.
+    depth = 10000
+    annotation = "[" * depth + "int | str" + "]" * depth
+    root, _ = pydocchecker._parse_annotation(annotation)
+    assert root.text == annotation.replace(" ", "")
+    checker = pydocchecker._check(annotation)
+    assert checker.item is pydocchecker._check(annotation[1:-1])
+    assert pydocchecker._check("{int: [str|int]}").value is \
+        pydocchecker._check("[ str | int ]")
+    assert_warnings(0)
+
+    # Names of modules are not types.
+    testsuite.testi.modulea.quux(1)
+    assert_warnings(0)
+
+    # The exceptions raised are propagated unchanged, and not checked
+    # against an invalid annotation.
+    error = KeyError(1)
+    try:
+        testsuite.testi.modulea.qux(error)
+    except KeyError as raised:
+        assert raised is error, "The exception was not propagated."
+    else:
+        assert False, "The exception was not propagated."
+    assert_warnings(0)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testi"], debug=5)
+    sys.exit(main())
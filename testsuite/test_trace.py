@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the tracing of the decoration."""
+
+import sys
+
+import testsuite.testj.modulea
+
+from testsuite.test_all import pydocchecker
+
+
+def main():
+    events = []
+    pydocchecker.add_trace_sink(events.append)
+
+    # Without debug, only the phases are traced, and q is not needed.
+    pydocchecker.check_all(["testsuite.testj"])
+    assert "q" not in sys.modules, "q imported without debug."
+    phases = [event["phase"] for event in events]
+    assert phases == ["install_types", "decorate", "fix_references"], \
+        "Wrong phases: %s." % phases
+    assert all(event["event"] == "phase" and event["duration"] >= 0
+               for event in events), "Wrong events."
+
+    # With debug, also the log messages up to that level.
+    del events[:]
+    pydocchecker.check_all(["testsuite.testj"], debug=4)
+    messages = [event for event in events if event["event"] == "log"]
+    assert len(messages) > 0 and \
+        all(event["level"] <= 4 for event in messages), "Wrong messages."
+    assert any("Missing type information for argument `a' in `bar'" in
+               event["message"] for event in messages), "Missing message."
+
+    pydocchecker.remove_trace_sink(events.append)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the auto-tuning of the checks within a budget."""
+
+import sys
+
+import testsuite.testl.modulea
+
+from testsuite.test_all import assert_warnings, pydocchecker
+
+
+def main():
+    module = testsuite.testl.modulea
+    pydocchecker.TUNING_WINDOW = 10
+    items = [(i, i) for i in range(2000)]
+
+    # Checked until the end of the first window.
+    module.expensive([None])
+    assert_warnings(1)
+
+    for _ in range(20):
+        module.expensive(items)
+        module.cheap(100000)
+    modes = pydocchecker.tuning_modes()
+    assert modes["expensive"] == "off", "Expensive checks not demoted."
+    assert modes["cheap"] == "on", "Cheap checks demoted."
+
+    module.expensive([None])
+    assert_warnings(0)
+
+    # Cold functions are checked again.
+    pydocchecker.TUNING_COLD = 0.0
+    for _ in range(10):
+        module.expensive(items)
+    assert pydocchecker.tuning_modes()["expensive"] == "on", \
+        "Cold function not promoted."
+    module.expensive([None])
+    assert_warnings(1)
+
+    return 0
+
+
+if __name__ == "__main__":
+    pydocchecker.check_all(["testsuite.testl"], debug=5,
+                           overhead_budget=0.05)
+    sys.exit(main())
@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
 # Pydoc Checker
@@ -31,7 +31,7 @@ from testsuite.test_all import assert_warnings, pydocchecker
 def main():
     # The module contains functions with lists of correct and not
     # correct values.
-    for name, function in testsuite.testd.modulea.__dict__.iteritems():
+    for name, function in testsuite.testd.modulea.__dict__.items():
         if callable(function):
             for obj in function.ok:
                 function(obj)
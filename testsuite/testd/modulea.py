@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
 # Pydoc Checker
@@ -19,6 +19,13 @@
 
 """Test instance."""
 
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 def foo_list_1(list_int):
     """Testing list.
@@ -71,6 +78,168 @@ foo_list_2.not_ok = [
     ]
 
 
+def foo_list_3(list_float):
+    """Testing list.
+
+    list_float ([float|None]): a list of floats or None.
+
+    return ([float|None]): list_float.
+
+    """
+    return list_float
+foo_list_3.ok = [
+    [1.0],
+    [1.0, None, 2.0],
+    list(),
+    ]
+foo_list_3.not_ok = [
+    None,
+    [1],
+    [1.0, "1.0"],
+    (1.0,),
+    array.array("d", [1.0]),
+    ]
+
+
+def foo_set_1(set_int):
+    """Testing set.
+
+    set_int (<int>): a set of integers.
+
+    return (<int>): set_int.
+
+    """
+    return set_int
+foo_set_1.ok = [
+    set([1, True]),
+    set(),
+    ]
+foo_set_1.not_ok = [
+    None,
+    [1],
+    set([1, 1.0, 2.5]),
+    ]
+
+
+def foo_buffer_1(buffer_int):
+    """Testing buffer.
+
+    buffer_int (int_buffer): a buffer of integers.
+
+    return (int_buffer): buffer_int.
+
+    """
+    return buffer_int
+foo_buffer_1.ok = [
+    array.array("i", [1, 2]),
+    array.array("q"),
+    memoryview(array.array("h", [1])),
+    b"",
+    ]
+foo_buffer_1.not_ok = [
+    None,
+    [1, 2],
+    array.array("d", [1.0]),
+    1,
+    ]
+
+
+def foo_buffer_2(buffer_float):
+    """Testing buffer.
+
+    buffer_float (float_buffer): a buffer of floats.
+
+    return (float_buffer): buffer_float.
+
+    """
+    return buffer_float
+foo_buffer_2.ok = [
+    array.array("d", [1.0]),
+    array.array("f"),
+    ]
+foo_buffer_2.not_ok = [
+    None,
+    [1.0],
+    array.array("i", [1]),
+    b"",
+    ]
+
+
+def foo_array_1(array_float):
+    """Testing arrays of any shape.
+
+    array_float (float64[...]): an array of floats.
+
+    return (float64[...]): array_float.
+
+    """
+    return array_float
+foo_array_1.ok = [
+    array.array("d", [1.0]),
+    array.array("d"),
+    memoryview(array.array("d", [1.0] * 6)).cast("B").cast("d", (2, 3)),
+    ]
+foo_array_1.not_ok = [
+    None,
+    [1.0],
+    array.array("f", [1.0]),
+    array.array("q", [1]),
+    ]
+
+
+def foo_array_2(matrix):
+    """Testing arrays with named dimensions.
+
+    matrix (int[n, n]): a square matrix of integers.
+
+    return (int[n, n]): matrix.
+
+    """
+    return matrix
+foo_array_2.ok = [
+    memoryview(array.array("i", range(4))).cast("B").cast("i", (2, 2)),
+    memoryview(bytes(9)).cast("b", (3, 3)),
+    ]
+foo_array_2.not_ok = [
+    None,
+    [[1, 2], [3, 4]],
+    array.array("i", range(4)),
+    memoryview(array.array("i", range(6))).cast("B").cast("i", (2, 3)),
+    memoryview(bytes(9)).cast("B", (3, 3)),
+    ]
+
+
+def foo_array_3(image):
+    """Testing arrays with trailing dimensions.
+
+    image (uint8[..., 3]): pixels.
+
+    return (uint8[..., 3]): image.
+
+    """
+    return image
+foo_array_3.ok = [
+    memoryview(bytes(3)),
+    memoryview(bytes(12)).cast("B", (2, 2, 3)),
+    ]
+foo_array_3.not_ok = [
+    None,
+    bytes(4),
+    memoryview(bytes(12)).cast("b", (4, 3)),
+    memoryview(bytes(12)).cast("B", (3, 4)),
+    ]
+
+
+if numpy is not None:
+    foo_array_1.ok.append(numpy.zeros((2, 3, 4)))
+    foo_array_1.not_ok.append(numpy.zeros(2, dtype=numpy.float32))
+    foo_array_2.ok.append(numpy.zeros((3, 3), dtype=numpy.int16))
+    foo_array_2.not_ok.append(numpy.zeros((3, 3)))
+    foo_array_2.not_ok.append(numpy.zeros((3, 4), dtype=numpy.int16))
+    foo_array_3.ok.append(numpy.zeros((5, 5, 3), dtype=numpy.uint8))
+    foo_array_3.not_ok.append(numpy.zeros((5, 5, 4), dtype=numpy.uint8))
+
+
 def foo_tuple_1(tuple_two_ints):
     """Testing tuple.
 
@@ -195,8 +364,7 @@ def foo_dict_2(dict_):
     """
     return dict_
 foo_dict_2.ok = [
-    {u"a": (1, u"b")},
-    {u"a": (1, "b")},
+    {"a": (1, "b")},
     {u"a": (1, "b"), u"b": (-1, "c")},
     dict(),
     ]
@@ -205,9 +373,9 @@ foo_dict_2.not_ok = [
     list(),
     set(),
     tuple(),
-    {"a": (1, "b")},
-    {u"a": 1},
-    {u"a": (1,)},
+    {b"a": (1, "b")},
+    {"a": 1},
+    {"a": (1,)},
     ]
 
 
@@ -239,6 +407,52 @@ foo_dict_3.not_ok = [
     ]
 
 
+def foo_dict_4(dict_):
+    """Testing records with a single key.
+
+    dict_ ({'key': int}): a dictionary.
+
+    return ({"key": int}): dict_.
+
+    """
+    return dict_
+foo_dict_4.ok = [
+    {"key": 1},
+    {"key": 1, "other": "a"},
+    ]
+foo_dict_4.not_ok = [
+    None,
+    dict(),
+    {"key": "a"},
+    {int: 1},
+    {"other": 1},
+    ]
+
+
+def foo_dict_5(dict_):
+    """Testing records with optional keys.
+
+    dict_ ({'keya': int, 'keyb'?: unicode|None}): a dictionary.
+
+    return ({'keya': int, 'keyb'?: unicode|None}): dict_.
+
+    """
+    return dict_
+foo_dict_5.ok = [
+    {"keya": 1},
+    {"keya": 1, "keyb": None},
+    {"keya": 1, "keyb": "b"},
+    {"keya": 1, "keyc": 1},
+    ]
+foo_dict_5.not_ok = [
+    None,
+    dict(),
+    {"keyb": "b"},
+    {"keya": "a"},
+    {"keya": 1, "keyb": 1},
+    ]
+
+
 def foo_or_1(obj):
     """Testing or.
 
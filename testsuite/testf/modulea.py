@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+
+class CustomError(Exception):
+    pass
+
+
+def raise_expected(error):
+    """Raise error, which is always expected.
+
+    error (Exception): the exception to raise.
+
+    raise (KeyError|ValueError): always.
+    raise (testf.modulea.CustomError): always.
+
+    """
+    raise error
+
+
+def raise_undocumented(error):
+    """Raise error, but the pydoc does not describe any exception.
+
+    error (Exception): the exception to raise.
+
+    """
+    raise error
+
+
+def raise_without_types(error):
+    """Raise error, but the pydoc does not have any type annotation.
+
+    """
+    raise error
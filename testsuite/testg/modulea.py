@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+
+class Base(object):
+    def foo(self, a, b):
+        """foo
+
+        a (int): an integer.
+        b (string): a string.
+
+        return (int): a.
+
+        """
+        return a
+
+
+class ChildWithoutPydoc(Base):
+    def foo(self, a, b):
+        return a
+
+
+class ChildWithPartialPydoc(Base):
+    def foo(self, a, b):
+        """foo, where a may also be None.
+
+        a (int|None): an integer or None.
+
+        """
+        return a
+
+
+class GrandChild(ChildWithoutPydoc):
+    def foo(self, a, b):
+        return b
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+
+def foo(a, b):
+    """foo
+
+    a ([int, str]): not a valid type.
+    b (int): an integer.
+
+    return ({a: int, b}): not a valid type.
+
+    """
+    return a
+
+
+def bar(a):
+    """bar
+
+    a ([[[[{int: (int, [string|None])}]]]]): a deeply nested type.
+
+    """
+    pass
+
+
+def baz(a, b, c):
+    """baz
+
+    a ({'key': int, key: int}): not a valid type.
+    b ({'key': int, 'key'?: int}): not a valid type.
+    c ({int: 'value'}): not a valid type.
+
+    """
+    pass
+
+
+def qux(error):
+    """qux
+
+    error (Exception): the exception to raise.
+
+    raise (KeyError|): not a valid type.
+
+    """
+    raise error
+
+
+def quux(a):
+    """quux
+
+    a (gc): a module, not a type.
+
+    """
+    pass
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+import asyncio
+
+
+async def foo(a):
+    """foo
+
+    a (int): an integer.
+
+    return (int): an integer.
+
+    raise (KeyError): if a is negative.
+
+    """
+    await asyncio.sleep(0)
+    if a < 0:
+        raise KeyError(a)
+    return a if a > 0 else None
+
+
+async def bar(n):
+    """bar
+
+    n (int): the number of items.
+
+    yield (int): the items, a string instead of the last.
+
+    """
+    for i in range(n):
+        received = yield (i if i < n - 1 else str(i))
+        if received is not None:
+            n = received
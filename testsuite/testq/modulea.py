@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+
+class ClassA(object):
+    """A class with descriptors."""
+
+    def __init__(self):
+        self._value = 0
+
+    @staticmethod
+    def static(a):
+        """static
+
+        a (int): an integer.
+
+        return (int): the same integer.
+
+        """
+        return a
+
+    @classmethod
+    def create(cls, a):
+        """create
+
+        a (int): an integer.
+
+        return (ClassA): a new instance.
+
+        """
+        return cls()
+
+    @property
+    def value(self):
+        """value
+
+        return (int): the value.
+
+        """
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        """value
+
+        value (int): the new value, possibly invalid.
+
+        """
+        self._value = value
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+
+def foo(a, b=1, *args, c=2, **kwargs):
+    """foo
+
+    a (int): an integer.
+    b (int): another integer.
+    c (int): a keyword-only integer.
+
+    return (int): the sum of a, b and c.
+
+    raise (KeyError): if a is negative.
+
+    """
+    if a < 0:
+        raise KeyError(a)
+    return a + b + c
+
+
+def _make_bar():
+    offset = 1
+
+    def bar(a):
+        """bar
+
+        a (int): an integer.
+
+        return (int): a plus a value in the closure.
+
+        """
+        return a + offset
+    bar.__module__ = __name__
+    return bar
+
+
+bar = _make_bar()
+
+
+# References that _fix_references would not find.
+CALLBACKS = {"foo": foo, "bar": [bar]}
+
+
+class ClassA(object):
+    """A class."""
+
+    def method(self, a):
+        """method
+
+        a (int): an integer.
+
+        """
+        pass
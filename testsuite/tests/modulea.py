@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+
+def foo(a, b=None, *args, **kwargs):
+    """foo
+
+    a (int): an integer.
+    b (int): an integer, with an invalid default.
+    args ([int]): more integers.
+    kwargs ({str: int}): even more integers.
+
+    return (int): a, or None if b is 0.
+
+    """
+    if b == 0:
+        return None
+    return a
+
+
+def bar(a):
+    """bar
+
+    a (int): an integer.
+
+    return (int): never returned, as it raises.
+
+    """
+    raise KeyError(a)
+
+
+class ClassA(object):
+    """A class."""
+
+    def method(self, a):
+        """method
+
+        a (int): an integer.
+
+        """
+        pass
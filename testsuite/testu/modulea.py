@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Pydoc Checker
+# Copyright © 2013 Stefano Maggiolo <s.maggiolo@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test instance."""
+
+
+def lookup(key, default=None):
+    """Function with unions.
+
+    key (int|unicode): the key.
+    default (int|None): the value if key is missing.
+
+    return ([int|float]): the values found.
+
+    """
+    return [1]
+
+
+def configure(options):
+    """Function with a record.
+
+    options ({'name': unicode, 'size'?: int}): the options.
+
+    """
+    pass
+
+
+def unused(n):
+    """Function never called.
+
+    n (int): a number.
+
+    """
+    pass
+
+
+def undocumented(n):
+    pass